@@ -1,80 +1,371 @@
 # data_analysis.py
+"""
+Nutritional analysis pipeline for All_Diets.csv.
+
+Stages:
+1. load    - read the CSV, normalize column names, coerce macros to numbers
+             and fill missing values with the column mean
+2. metrics - average macros, top 5 protein-rich recipes and the most common
+             cuisine per diet type, all from one factorization of the diet
+             column (no per-group Python callbacks)
+3. charts  - bar chart, heatmap and scatter plot, each rendered in its own
+             worker process on the headless Agg backend
+
+With --stream, stages 1 and 2 are replaced by stream_metrics(), which reads
+the CSV in chunks and keeps only running statistics, so memory stays flat
+for files larger than RAM. Its results match the in-memory path, including
+the mean fill of missing macros.
+
+Usage:
+
+    python data_analysis.py
+    python data_analysis.py --input datasets/All_Diets.csv --output-dir screenshots --workers 3
+    python data_analysis.py --skip-charts
+    python data_analysis.py --stream --chunk-rows 100000 --input big.csv
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
 
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import seaborn as sns
 
+from diet_stats import (
+    DEFAULT_CHUNK_ROWS,
+    DIET_COLUMN,
+    MACRO_COLUMNS,
+    average_macronutrients,
+    merge_partials,
+    partial_from_frame,
+)
+
+DEFAULT_INPUT = os.path.join('datasets', 'All_Diets.csv')
+DEFAULT_OUTPUT_DIR = 'screenshots'
+MACROS = ['protein', 'carbs', 'fat']
+TOP_N = 5
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
 # -------------------------------
 # Step 1: Load Dataset
 # -------------------------------
-df = pd.read_csv('./datasets/All_Diets.csv')
 
-# Normalize column names
-df.columns = [c.strip().lower().replace(" ", "_").replace("(g)", "").replace("__","_") for c in df.columns]
+def normalize_frame(df):
+    # Normalize column names
+    df.columns = [c.strip().lower().replace(" ", "_").replace("(g)", "").replace("__", "_") for c in df.columns]
 
-# Ensure numeric columns
-for col in ['protein', 'carbs', 'fat']:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Ensure numeric columns
+    for col in MACROS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def load_dataset(path=DEFAULT_INPUT):
+    df = normalize_frame(pd.read_csv(path))
+
+    # Handle missing values: fill with mean per column
+    df[MACROS] = df[MACROS].fillna(df[MACROS].mean())
+
+    # Derived ratios
+    df['protein_to_carbs_ratio'] = df['protein'] / df['carbs'].replace(0, np.nan)
+    df['carbs_to_fat_ratio'] = df['carbs'] / df['fat'].replace(0, np.nan)
+    return df
 
-# Handle missing values: fill with mean per column
-df[['protein','carbs','fat']] = df[['protein','carbs','fat']].fillna(df[['protein','carbs','fat']].mean())
 
 # -------------------------------
 # Step 2: Compute Metrics
 # -------------------------------
 
-# Average macronutrient content per diet type
-avg_macros = df.groupby('diet_type')[['protein','carbs','fat']].mean()
-print("Average macronutrients per Diet Type:\n", avg_macros)
+def compute_metrics(df):
+    """
+    Compute every per-diet metric from one factorization of diet_type.
+
+    Returns:
+        dict: avg_macros (DataFrame), top_protein (DataFrame),
+              diet_highest_protein (str), common_cuisines (Series)
+    """
+    # Rows without a diet type are excluded, as groupby would
+    diet_codes, diets = pd.factorize(df['diet_type'], sort=True)
+    valid = diet_codes >= 0
+    codes = diet_codes[valid]
+    n_diets = len(diets)
+    index = pd.Index(diets, name='diet_type')
+
+    # Average macronutrient content per diet type
+    values = df.loc[valid, MACROS].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    sums = np.stack([
+        np.bincount(codes, weights=np.where(present[:, i], values[:, i], 0.0), minlength=n_diets)
+        for i in range(len(MACROS))
+    ], axis=1)
+    counts = np.stack([
+        np.bincount(codes, weights=present[:, i], minlength=n_diets) for i in range(len(MACROS))
+    ], axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_macros = pd.DataFrame(sums / counts, index=index, columns=MACROS)
+
+    # Top 5 protein-rich recipes per diet type: sort by (diet, -protein), then
+    # keep the first TOP_N positions of each diet's block
+    positions = np.flatnonzero(valid)
+    protein = values[:, MACROS.index('protein')]
+    order = np.lexsort((-np.nan_to_num(protein, nan=-np.inf), codes))
+    group_sizes = np.bincount(codes, minlength=n_diets)
+    group_starts = np.concatenate(([0], np.cumsum(group_sizes)[:-1]))
+    rank = np.arange(len(order)) - group_starts[codes[order]]
+    # File order before the final stable sort, so ties keep their input order
+    top_rows = np.sort(positions[order[rank < TOP_N]])
+    top_protein = df.iloc[top_rows].sort_values('protein', ascending=False, kind='stable')
+
+    # Diet type with highest protein content (mean)
+    diet_highest_protein = avg_macros['protein'].idxmax()
+
+    # Most common cuisine per diet type: count (diet, cuisine) pairs in one
+    # bincount and take the arg max of each diet's row
+    cuisine_codes, cuisines = pd.factorize(df.loc[valid, 'cuisine_type'], sort=True)
+    has_cuisine = cuisine_codes >= 0
+    n_cuisines = max(len(cuisines), 1)
+    pair_counts = np.bincount(
+        codes[has_cuisine] * n_cuisines + cuisine_codes[has_cuisine],
+        minlength=n_diets * n_cuisines,
+    ).reshape(n_diets, n_cuisines)
+    common = np.asarray(cuisines, dtype=object)[pair_counts.argmax(axis=1)] if len(cuisines) else [None] * n_diets
+    common_cuisines = pd.Series(common, index=index, name='cuisine_type')
+
+    return {
+        'avg_macros': avg_macros,
+        'top_protein': top_protein,
+        'diet_highest_protein': diet_highest_protein,
+        'common_cuisines': common_cuisines,
+    }
+
+
+def _top_candidates(df):
+    """
+    Rows that can still end up in a diet's top TOP_N by protein: the TOP_N
+    highest known values, plus the first TOP_N missing ones, whose fill value
+    is only known at the end. Kept in file order so ties resolve as in
+    compute_metrics().
+    """
+    known = df[df['protein'].notna()].sort_values('protein', ascending=False, kind='stable')
+    missing = df[df['protein'].isna()]
+    return pd.concat([
+        known.groupby('diet_type').head(TOP_N),
+        missing.groupby('diet_type').head(TOP_N),
+    ]).sort_index()
+
+
+def stream_metrics(source=DEFAULT_INPUT, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Compute the same metrics as compute_metrics(load_dataset(source)) while
+    holding at most chunk_rows rows, plus a few top-protein candidates per
+    diet, in memory.
+
+    Args:
+        source: CSV path or readable binary stream
+        chunk_rows: Rows parsed per chunk
+    """
+    partial = {}
+    column_counts = np.zeros(len(MACROS))
+    column_sums = np.zeros(len(MACROS))
+    cuisine_counts = None
+    candidates = None
+
+    for chunk in pd.read_csv(source, chunksize=chunk_rows):
+        partial = merge_partials(partial, partial_from_frame(chunk))
+        chunk = normalize_frame(chunk)
 
-# Top 5 protein-rich recipes per diet type
-top_protein = df.sort_values('protein', ascending=False).groupby('diet_type').head(5)
-print("\nTop 5 protein-rich recipes per Diet Type:\n", top_protein[['diet_type','recipe_name','cuisine_type','protein','carbs','fat']])
+        # The fill value is the mean over every row, including rows without a diet type
+        column_counts += chunk[MACROS].count().to_numpy()
+        column_sums += chunk[MACROS].sum().to_numpy()
 
-# Diet type with highest protein content (mean)
-diet_highest_protein = avg_macros['protein'].idxmax()
-print(f"\nDiet type with highest average protein: {diet_highest_protein}")
+        pairs = chunk.groupby(['diet_type', 'cuisine_type']).size()
+        cuisine_counts = pairs if cuisine_counts is None else cuisine_counts.add(pairs, fill_value=0)
+        candidates = _top_candidates(pd.concat([candidates, chunk]))
 
-# Most common cuisines per diet type
-common_cuisines = df.groupby('diet_type')['cuisine_type'].agg(lambda x: x.value_counts().idxmax())
-print("\nMost common cuisine per Diet Type:\n", common_cuisines)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fill = dict(zip(MACROS, column_sums / column_counts))
+
+    records = average_macronutrients(partial, fill={col: fill[macro] for col, macro in zip(MACRO_COLUMNS, MACROS)})
+    avg_macros = pd.DataFrame(records).set_index(DIET_COLUMN).rename(columns=dict(zip(MACRO_COLUMNS, MACROS)))
+    avg_macros.index.name = 'diet_type'
+
+    candidates[MACROS] = candidates[MACROS].fillna(fill)
+    top_protein = (
+        candidates.sort_values('protein', ascending=False, kind='stable')
+        .groupby('diet_type').head(TOP_N)
+    )
+
+    # Ties go to the alphabetically first cuisine, as in compute_metrics()
+    common_cuisines = cuisine_counts.unstack(fill_value=0).idxmax(axis=1).reindex(avg_macros.index)
+    common_cuisines.name = 'cuisine_type'
+
+    return {
+        'avg_macros': avg_macros,
+        'top_protein': top_protein,
+        'diet_highest_protein': avg_macros['protein'].idxmax(),
+        'common_cuisines': common_cuisines,
+    }
+
+
+def print_metrics(metrics):
+    print("Average macronutrients per Diet Type:\n", metrics['avg_macros'])
+    print("\nTop 5 protein-rich recipes per Diet Type:\n",
+          metrics['top_protein'][['diet_type', 'recipe_name', 'cuisine_type', 'protein', 'carbs', 'fat']])
+    print(f"\nDiet type with highest average protein: {metrics['diet_highest_protein']}")
+    print("\nMost common cuisine per Diet Type:\n", metrics['common_cuisines'])
 
-# New metrics
-df['protein_to_carbs_ratio'] = df['protein'] / df['carbs'].replace(0, np.nan)
-df['carbs_to_fat_ratio'] = df['carbs'] / df['fat'].replace(0, np.nan)
 
 # -------------------------------
 # Step 3: Visualizations
 # -------------------------------
 
-sns.set(style="whitegrid")
-
-# 1. Bar chart for average macronutrients per diet type
-avg_macros.plot(kind='bar', figsize=(10,6))
-plt.title("Average Macronutrients by Diet Type")
-plt.ylabel("Grams")
-plt.xticks(rotation=45)
-plt.savefig("./screenshots/avg_macros_bar.png")
-
-# 2. Heatmap: macronutrients vs diet type
-plt.figure(figsize=(10,6))
-sns.heatmap(avg_macros, annot=True, fmt=".2f", cmap="YlGnBu")
-plt.title("Heatmap of Average Macronutrients per Diet Type")
-plt.savefig("./screenshots/macros_heatmap.png")
-
-# 3. Scatter plot: Top 5 protein-rich recipes per diet type
-plt.figure(figsize=(12,6))
-sns.scatterplot(
-    data=top_protein,
-    x='recipe_name',
-    y='protein',
-    hue='diet_type',
-    style='cuisine_type',
-    s=100
-)
-plt.xticks(rotation=90)
-plt.ylabel("Protein (g)")
-plt.title("Top 5 Protein-Rich Recipes per Diet Type")
-plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-plt.savefig("./screenshots/top_protein_scatter.png", bbox_inches="tight")
+def plot_avg_macros_bar(avg_macros, path):
+    # 1. Bar chart for average macronutrients per diet type
+    fig, ax = plt.subplots(figsize=(10, 6))
+    avg_macros.plot(kind='bar', ax=ax)
+    ax.set_title("Average Macronutrients by Diet Type")
+    ax.set_ylabel("Grams")
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def plot_macros_heatmap(avg_macros, path):
+    # 2. Heatmap: macronutrients vs diet type
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(avg_macros, annot=True, fmt=".2f", cmap="YlGnBu", ax=ax)
+    ax.set_title("Heatmap of Average Macronutrients per Diet Type")
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def plot_top_protein_scatter(top_protein, path):
+    # 3. Scatter plot: Top 5 protein-rich recipes per diet type
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.scatterplot(
+        data=top_protein,
+        x='recipe_name',
+        y='protein',
+        hue='diet_type',
+        style='cuisine_type',
+        s=100,
+        ax=ax,
+    )
+    ax.tick_params(axis='x', labelrotation=90)
+    ax.set_ylabel("Protein (g)")
+    ax.set_title("Top 5 Protein-Rich Recipes per Diet Type")
+    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.savefig(path, bbox_inches="tight")
+    plt.close(fig)
+
+
+def _render(plot, data, path):
+    sns.set_theme(style="whitegrid")
+    started = time.perf_counter()
+    plot(data, path)
+    return _elapsed_ms(started)
+
+
+def chart_jobs(metrics, output_dir):
+    """
+    (name, plot function, data, output path) for every chart
+    """
+    return [
+        ('avg_macros_bar', plot_avg_macros_bar, metrics['avg_macros'],
+         os.path.join(output_dir, 'avg_macros_bar.png')),
+        ('macros_heatmap', plot_macros_heatmap, metrics['avg_macros'],
+         os.path.join(output_dir, 'macros_heatmap.png')),
+        ('top_protein_scatter', plot_top_protein_scatter, metrics['top_protein'],
+         os.path.join(output_dir, 'top_protein_scatter.png')),
+    ]
+
+
+def render_charts(metrics, output_dir=DEFAULT_OUTPUT_DIR, workers=3):
+    """
+    Render all charts, in parallel worker processes unless workers is 0.
+
+    Returns:
+        dict: Render time in ms per chart
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = chart_jobs(metrics, output_dir)
+    if workers <= 0:
+        return {name: _render(plot, data, path) for name, plot, data, path in jobs}
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        futures = {name: executor.submit(_render, plot, data, path) for name, plot, data, path in jobs}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def run_pipeline(input_path=DEFAULT_INPUT, output_dir=DEFAULT_OUTPUT_DIR, workers=3, charts=True,
+                 stream=False, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Run every stage and report how long each took.
+
+    Returns:
+        tuple: (metrics dict, timings dict in ms)
+    """
+    timings = {}
+    started = time.perf_counter()
+
+    if stream:
+        stage = time.perf_counter()
+        metrics = stream_metrics(input_path, chunk_rows)
+        timings['stream_metrics_ms'] = _elapsed_ms(stage)
+    else:
+        stage = time.perf_counter()
+        df = load_dataset(input_path)
+        timings['load_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        metrics = compute_metrics(df)
+        timings['metrics_ms'] = _elapsed_ms(stage)
+
+    if charts:
+        stage = time.perf_counter()
+        timings['chart_render_ms'] = render_charts(metrics, output_dir, workers)
+        timings['charts_ms'] = _elapsed_ms(stage)
+
+    timings['total_ms'] = _elapsed_ms(started)
+    return metrics, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze nutritional data and render charts")
+    parser.add_argument('--input', default=DEFAULT_INPUT, help=f"CSV to analyze (default: {DEFAULT_INPUT})")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f"Directory for the chart images (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--workers', type=int, default=3,
+                        help="Chart rendering processes; 0 renders in this process (default: 3)")
+    parser.add_argument('--skip-charts', action='store_true', help="Only compute and print the metrics")
+    parser.add_argument('--stream', action='store_true',
+                        help="Aggregate the CSV in chunks instead of loading it whole")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows per chunk with --stream (default: {DEFAULT_CHUNK_ROWS})")
+    args = parser.parse_args()
+
+    metrics, timings = run_pipeline(args.input, args.output_dir, args.workers, charts=not args.skip_charts,
+                                    stream=args.stream, chunk_rows=args.chunk_rows)
+    print_metrics(metrics)
+
+    print("\nStage timings (ms):")
+    for name, value in timings.items():
+        if isinstance(value, dict):
+            for chart, ms in value.items():
+                print(f"  {name}.{chart}: {ms}")
+        else:
+            print(f"  {name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
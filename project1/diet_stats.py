@@ -0,0 +1,244 @@
+# diet_stats.py
+"""
+Mergeable per-diet macronutrient statistics.
+
+A partial holds, for every diet type and macronutrient, the count, sum, sum
+of squares, min and max of the non-missing values. Partials computed from
+separate files (or separate chunks of one file) merge exactly, so results
+can be updated by folding in only the data that changed.
+
+partial_from_csv() builds a partial from a CSV path or any binary stream
+(IterStream wraps a blob download) one bounded chunk at a time, so memory use
+does not grow with the file size.
+"""
+
+import io
+import math
+
+import pandas as pd
+
+DIET_COLUMN = "Diet_type"
+MACRO_COLUMNS = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Substrings used to find the columns when a file uses different names
+COLUMN_HINTS = {
+    DIET_COLUMN: "diet",
+    "Protein(g)": "protein",
+    "Carbs(g)": "carb",
+    "Fat(g)": "fat",
+}
+
+
+def normalize_columns(df):
+    """
+    Return df with the diet and macro columns under their standard names.
+    Raises ValueError if any of them cannot be found.
+    """
+    required_cols = [DIET_COLUMN] + MACRO_COLUMNS
+    missing_cols = [col for col in required_cols if col not in df.columns]
+    if not missing_cols:
+        return df
+
+    print(
+        f"Warning: Missing columns {missing_cols}. Available columns: {list(df.columns)}"
+    )
+    renames = {}
+    for col in missing_cols:
+        match = next((c for c in df.columns if COLUMN_HINTS[col] in c.lower()), None)
+        if match is None:
+            raise ValueError("Cannot find required nutritional columns in the dataset")
+        renames[match] = col
+    print(f"Using alternative column names: {renames}")
+    return df.rename(columns=renames)
+
+
+def empty_macro_stats():
+    return {"count": 0, "sum": 0.0, "sumsq": 0.0, "min": None, "max": None}
+
+
+def partial_from_frame(df):
+    """
+    Compute the partial statistics of one DataFrame.
+
+    Returns:
+        dict: {diet: {'rows': n, 'macros': {macro: {count, sum, sumsq, min, max}}}}
+    """
+    df = normalize_columns(df)
+    macros = df[MACRO_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    grouped = macros.groupby(df[DIET_COLUMN])
+    aggregated = grouped.agg(["count", "sum", "min", "max"])
+    sumsq = (macros**2).groupby(df[DIET_COLUMN]).sum()
+    rows = df.groupby(DIET_COLUMN).size()
+
+    partial = {}
+    for diet in aggregated.index:
+        macro_stats = {}
+        for col in MACRO_COLUMNS:
+            count = int(aggregated.at[diet, (col, "count")])
+            macro_stats[col] = {
+                "count": count,
+                "sum": float(aggregated.at[diet, (col, "sum")]),
+                "sumsq": float(sumsq.at[diet, col]),
+                "min": float(aggregated.at[diet, (col, "min")]) if count else None,
+                "max": float(aggregated.at[diet, (col, "max")]) if count else None,
+            }
+        partial[str(diet)] = {"rows": int(rows.at[diet]), "macros": macro_stats}
+    return partial
+
+
+class IterStream(io.RawIOBase):
+    """
+    Read-only binary file object over an iterator of bytes chunks, such as
+    StorageStreamDownloader.chunks(), so pandas can parse a download while
+    it is still arriving
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b"")
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            try:
+                self._buffer = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        self.bytes_read += n
+        return n
+
+
+def partial_from_csv(source, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Compute the partial statistics of a CSV, chunk_rows rows at a time.
+
+    Args:
+        source: File path or readable binary stream
+        chunk_rows: Rows parsed per chunk; bounds memory use
+
+    Returns:
+        tuple: (partial, total rows read)
+    """
+    partial, rows = {}, 0
+    for chunk in pd.read_csv(source, chunksize=chunk_rows):
+        partial = merge_partials(partial, partial_from_frame(chunk))
+        rows += len(chunk)
+    return partial, rows
+
+
+def _merge_macro(a, b):
+    mins = [v for v in (a["min"], b["min"]) if v is not None]
+    maxs = [v for v in (a["max"], b["max"]) if v is not None]
+    return {
+        "count": a["count"] + b["count"],
+        "sum": a["sum"] + b["sum"],
+        "sumsq": a["sumsq"] + b["sumsq"],
+        "min": min(mins) if mins else None,
+        "max": max(maxs) if maxs else None,
+    }
+
+
+def merge_partials(*partials):
+    """
+    Merge any number of partials into one.
+    """
+    merged = {}
+    for partial in partials:
+        for diet, stats in partial.items():
+            current = merged.setdefault(
+                diet,
+                {
+                    "rows": 0,
+                    "macros": {col: empty_macro_stats() for col in MACRO_COLUMNS},
+                },
+            )
+            current["rows"] += stats["rows"]
+            for col in MACRO_COLUMNS:
+                current["macros"][col] = _merge_macro(
+                    current["macros"][col], stats["macros"][col]
+                )
+    return merged
+
+
+def total_rows(partial):
+    return sum(stats["rows"] for stats in partial.values())
+
+
+def _mean(stats):
+    return stats["sum"] / stats["count"] if stats["count"] else None
+
+
+def _filled_mean(stats, rows, fill):
+    # Mean after replacing each of the (rows - count) missing values with fill
+    if not rows:
+        return None
+    return (stats["sum"] + (rows - stats["count"]) * fill) / rows
+
+
+def column_means(partial):
+    """
+    Mean of each macronutrient over all diets, ignoring missing values
+    """
+    means = {}
+    for col in MACRO_COLUMNS:
+        count = sum(partial[diet]["macros"][col]["count"] for diet in partial)
+        total = sum(partial[diet]["macros"][col]["sum"] for diet in partial)
+        means[col] = total / count if count else None
+    return means
+
+
+def _std(stats):
+    # Sample standard deviation, matching pandas' default
+    n = stats["count"]
+    if n < 2:
+        return None
+    variance = (stats["sumsq"] - stats["sum"] ** 2 / n) / (n - 1)
+    return math.sqrt(max(variance, 0.0))
+
+
+def average_macronutrients(partial, fill=None):
+    """
+    Mean macronutrients per diet, as records like
+    {'Diet_type': 'keto', 'Protein(g)': ..., 'Carbs(g)': ..., 'Fat(g)': ...}
+
+    Missing values are skipped, unless fill maps a macronutrient to the value
+    they should count as (e.g. column_means(partial), which reproduces
+    filling missing values with the column mean before grouping).
+    """
+
+    def mean(diet, col):
+        stats = partial[diet]["macros"][col]
+        if fill is None or fill.get(col) is None:
+            return _mean(stats)
+        return _filled_mean(stats, partial[diet]["rows"], fill[col])
+
+    return [
+        {DIET_COLUMN: diet, **{col: mean(diet, col) for col in MACRO_COLUMNS}}
+        for diet in sorted(partial)
+    ]
+
+
+def macronutrient_stats(partial):
+    """
+    Count, mean, standard deviation, min and max per diet and macronutrient.
+    """
+    return {
+        diet: {
+            col: {
+                "count": stats["count"],
+                "mean": _mean(stats),
+                "std": _std(stats),
+                "min": stats["min"],
+                "max": stats["max"],
+            }
+            for col, stats in partial[diet]["macros"].items()
+        }
+        for diet in sorted(partial)
+    }
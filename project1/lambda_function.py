@@ -1,93 +1,265 @@
+from azure.core import MatchConditions
 from azure.storage.blob import BlobServiceClient
 import pandas as pd
 import io
 import json
 import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def process_nutritional_data_from_azurite():
+from diet_stats import (
+    DEFAULT_CHUNK_ROWS,
+    IterStream,
+    average_macronutrients,
+    macronutrient_stats,
+    merge_partials,
+    partial_from_csv,
+    partial_from_frame,
+)
+from results_store import ResultsStore
+
+OUTPUT_DIR = 'simulated_nosql'
+# Append-only history of every run's results (see results_store.py)
+RESULTS_DB = os.path.join(OUTPUT_DIR, 'nutritional_results.db')
+# Per-blob ETags and partial statistics from earlier runs
+STATE_FILE = os.path.join(OUTPUT_DIR, 'processing_state.json')
+# The combined file is the union of the per-diet files, so multi-blob mode
+# skips it by default to avoid counting every recipe twice
+COMBINED_BLOB = 'All_Diets.csv'
+DEFAULT_WORKERS = 8
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {'blobs': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_FILE):
+    # Write to a temporary file first so a crash never leaves a truncated state
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def list_dataset_blobs(container_client, exclude=(COMBINED_BLOB,)):
+    """
+    Names of the CSV blobs in a container, minus the excluded ones
+    """
+    return sorted(
+        blob.name for blob in container_client.list_blobs()
+        if blob.name.endswith('.csv') and blob.name not in exclude
+    )
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def process_blob(container_client, blob_name, known_etag=None, stream=False,
+                 chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Download and aggregate one blob unless its ETag matches known_etag.
+
+    With stream=True the download is parsed chunk_rows rows at a time while
+    it arrives, so memory stays flat regardless of the blob size.
+
+    Returns:
+        tuple: (state entry or None if unchanged, per-stage timings in ms)
+    """
+    started = time.perf_counter()
+    blob_client = container_client.get_blob_client(blob_name)
+    etag = blob_client.get_blob_properties().etag
+    timings = {'etag_check_ms': _elapsed_ms(started)}
+
+    if etag == known_etag:
+        print(f"Skipping unchanged blob: {blob_name} (ETag {etag})")
+        timings['total_ms'] = _elapsed_ms(started)
+        return None, timings
+
+    print(f"Downloading blob: {blob_name} from container: {container_client.container_name}")
+
+    # Download only this version of the blob, so a concurrent upload
+    # cannot pair new contents with the old ETag
+    stage = time.perf_counter()
+    downloader = blob_client.download_blob(
+        etag=etag, match_condition=MatchConditions.IfNotModified
+    )
+
+    if stream:
+        body = IterStream(downloader.chunks())
+        partial, rows = partial_from_csv(body, chunk_rows)
+        size = body.bytes_read
+        timings['stream_ms'] = _elapsed_ms(stage)
+        print(f"Streamed {blob_name}: {rows} rows in chunks of {chunk_rows}")
+    else:
+        data = downloader.readall()
+        size = len(data)
+        timings['download_ms'] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        df = pd.read_csv(io.BytesIO(data))
+        rows = len(df)
+        timings['parse_ms'] = _elapsed_ms(stage)
+
+        print(f"Loaded {blob_name}: {len(df)} rows and {len(df.columns)} columns")
+
+        stage = time.perf_counter()
+        partial = partial_from_frame(df)
+        timings['aggregate_ms'] = _elapsed_ms(stage)
+    timings['total_ms'] = _elapsed_ms(started)
+
+    entry = {
+        'etag': etag,
+        'rows': rows,
+        'bytes': size,
+        'processed_at': datetime.now().isoformat(),
+        'partial': partial,
+    }
+    return entry, timings
+
+
+def process_nutritional_data_from_azurite(blob_names=(COMBINED_BLOB,), multi_blob=False,
+                                          max_workers=DEFAULT_WORKERS, stream=False,
+                                          chunk_rows=DEFAULT_CHUNK_ROWS):
     """
     Serverless function to process nutritional data from Azurite Blob Storage
-    and store results in simulated NoSQL storage (JSON file).
+    and append the results to the simulated NoSQL store (SQLite, RESULTS_DB).
+
+    Processing is incremental: each blob's ETag and per-diet partial statistics
+    are kept in STATE_FILE, only new or changed blobs are downloaded, and the
+    result is merged from the stored partials. When no blob changed since the
+    latest stored run over the same blobs, that run is returned and nothing new
+    is appended.
+
+    Args:
+        blob_names: Blobs in the 'datasets' container to aggregate
+        multi_blob: Ignore blob_names and aggregate every CSV blob in the
+                    container except the combined All_Diets.csv
+        max_workers: Blobs downloaded and parsed concurrently
+        stream: Parse each download in chunks of chunk_rows rows instead of
+                reading the whole blob into memory first
     """
     # Azurite connection string with the correct account key
     connect_str = "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;" \
                   "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;" \
                   "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1"
-    
+
     try:
+        run_started = time.perf_counter()
+
         # Initialize blob service client
         blob_service_client = BlobServiceClient.from_connection_string(connect_str)
-        
+
         container_name = 'datasets'
-        blob_name = 'All_Diets.csv'
-        
-        # Get container and blob clients
         container_client = blob_service_client.get_container_client(container_name)
-        blob_client = container_client.get_blob_client(blob_name)
-        
-        print(f"Downloading blob: {blob_name} from container: {container_name}")
-        
-        # Download blob content to bytes
-        stream = blob_client.download_blob().readall()
-        df = pd.read_csv(io.BytesIO(stream))
-        
-        print(f"Successfully loaded CSV with {len(df)} rows and {len(df.columns)} columns")
-        print(f"Columns: {list(df.columns)}")
-        
-        # Calculate average nutritional values per diet type
-        # Check if the expected columns exist
-        required_cols = ['Diet_type', 'Protein(g)', 'Carbs(g)', 'Fat(g)']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        
-        if missing_cols:
-            print(f"Warning: Missing columns {missing_cols}. Available columns: {list(df.columns)}")
-            # Try to find similar column names
-            protein_col = next((col for col in df.columns if 'protein' in col.lower()), None)
-            carbs_col = next((col for col in df.columns if 'carb' in col.lower()), None)
-            fat_col = next((col for col in df.columns if 'fat' in col.lower()), None)
-            diet_col = next((col for col in df.columns if 'diet' in col.lower()), None)
-            
-            if all([protein_col, carbs_col, fat_col, diet_col]):
-                print(f"Using alternative column names: {diet_col}, {protein_col}, {carbs_col}, {fat_col}")
-                avg_macros = df.groupby(diet_col)[[protein_col, carbs_col, fat_col]].mean()
-            else:
-                raise ValueError("Cannot find required nutritional columns in the dataset")
-        else:
-            avg_macros = df.groupby('Diet_type')[['Protein(g)', 'Carbs(g)', 'Fat(g)']].mean()
-        
+
+        if multi_blob:
+            blob_names = list_dataset_blobs(container_client)
+            print(f"Found {len(blob_names)} blobs: {blob_names}")
+        blob_names = list(blob_names)
+        if not blob_names:
+            raise ValueError(f"No CSV blobs to process in container: {container_name}")
+
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        state = load_state()
+        processed, skipped, timings = [], [], {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(blob_names)))) as executor:
+            futures = {
+                name: executor.submit(
+                    process_blob,
+                    container_client,
+                    name,
+                    state['blobs'].get(name, {}).get('etag'),
+                    stream,
+                    chunk_rows,
+                )
+                for name in blob_names
+            }
+            for name, future in futures.items():
+                entry, timings[name] = future.result()
+                if entry is None:
+                    skipped.append(name)
+                else:
+                    state['blobs'][name] = entry
+                    processed.append(name)
+
+        if not processed:
+            # Nothing changed since the last run over these blobs: its result stands
+            with ResultsStore(RESULTS_DB) as store:
+                latest = store.latest_run()
+            if latest is not None:
+                run_id, previous = latest
+                previous_blobs = previous['blobs']['processed'] + previous['blobs']['skipped']
+                if set(previous_blobs) == set(blob_names):
+                    print(f"No blob changed; keeping run {run_id} from {RESULTS_DB}")
+                    return {
+                        'statusCode': 200,
+                        'body': json.dumps({
+                            'message': 'No blob changed; previous result is current',
+                            'records_processed': previous['total_records_processed'],
+                            'blobs_processed': processed,
+                            'blobs_skipped': skipped,
+                            'results_db': RESULTS_DB,
+                            'run_id': run_id,
+                            'processing_time': previous['processing_timestamp']
+                        })
+                    }
+
+        totals = merge_partials(*(state['blobs'][name]['partial'] for name in blob_names))
+        total_records = sum(state['blobs'][name]['rows'] for name in blob_names)
+        avg_macros = average_macronutrients(totals)
+
         print("Calculated average macronutrients per diet type:")
-        print(avg_macros)
-        
-        # Prepare results for JSON storage
+        print(pd.DataFrame(avg_macros).set_index('Diet_type'))
+
+        print("Per-blob timings (ms):")
+        print(pd.DataFrame(timings).T.fillna('-'))
+
+        # Prepare the result document for the results store
         result = {
             'processing_timestamp': datetime.now().isoformat(),
-            'total_records_processed': len(df),
+            'total_records_processed': total_records,
             'diet_types_analyzed': len(avg_macros),
-            'average_macronutrients': avg_macros.reset_index().to_dict(orient='records')
+            'average_macronutrients': avg_macros,
+            'macronutrient_stats': macronutrient_stats(totals),
+            'recipe_counts': {diet: totals[diet]['rows'] for diet in sorted(totals)},
+            'blobs': {
+                'processed': processed,
+                'skipped': skipped,
+                'timings_ms': timings,
+            },
+            'total_processing_ms': _elapsed_ms(run_started),
         }
-        
-        # Create output directory if it doesn't exist
-        output_dir = 'simulated_nosql'
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Save results to simulated NoSQL storage (JSON file)
-        output_file = os.path.join(output_dir, 'nutritional_analysis_results.json')
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        print(f"Results successfully saved to: {output_file}")
-        
+
+        # Append results to the simulated NoSQL store
+        with ResultsStore(RESULTS_DB) as store:
+            run_id = store.append_run(result)
+
+        # Only now that the run is stored may later runs skip these blobs
+        if processed:
+            save_state(state)
+
+        print(f"Results successfully saved to: {RESULTS_DB} (run {run_id})")
+
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Data processed and stored successfully',
-                'records_processed': len(df),
-                'output_file': output_file,
+                'records_processed': total_records,
+                'blobs_processed': processed,
+                'blobs_skipped': skipped,
+                'results_db': RESULTS_DB,
+                'run_id': run_id,
                 'processing_time': datetime.now().isoformat()
             })
         }
-        
+
     except Exception as e:
         print(f"Error processing data: {str(e)}")
         return {
@@ -98,9 +270,22 @@ def process_nutritional_data_from_azurite():
             })
         }
 
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate nutritional data from Azurite")
+    parser.add_argument('--multi', action='store_true',
+                        help="Process every per-diet CSV blob concurrently instead of All_Diets.csv")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent blob downloads (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--stream', action='store_true',
+                        help="Aggregate each blob in chunks while it downloads")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows per chunk with --stream (default: {DEFAULT_CHUNK_ROWS})")
+    args = parser.parse_args()
+
     # Run the function when script is executed directly
     print("Starting serverless function execution...")
-    result = process_nutritional_data_from_azurite()
+    result = process_nutritional_data_from_azurite(multi_blob=args.multi, max_workers=args.workers,
+                                                   stream=args.stream, chunk_rows=args.chunk_rows)
     print("\nFunction execution completed.")
-    print(f"Result: {result}")
\ No newline at end of file
+    print(f"Result: {result}")
@@ -0,0 +1,209 @@
+# results_store.py
+"""
+Append-only results store backed by SQLite.
+
+Every run of lambda_function.py is appended as one row in `runs`, which holds
+the full result document, plus one row per diet in `diet_results`. Nothing
+is ever updated or deleted. `diet_results` is keyed by (diet_type,
+processed_at), so "latest result per diet" and "protein trend for a diet"
+read a few index entries instead of scanning every run.
+
+Query from the command line:
+
+    python results_store.py latest
+    python results_store.py trend keto --macro Protein(g) --limit 20
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+from diet_stats import DIET_COLUMN, MACRO_COLUMNS
+
+DEFAULT_DB = os.path.join("simulated_nosql", "nutritional_results.db")
+
+# Column prefix per macronutrient, e.g. Protein(g) -> protein_mean
+MACRO_FIELDS = {"Protein(g)": "protein", "Carbs(g)": "carbs", "Fat(g)": "fat"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    processed_at TEXT NOT NULL,
+    total_records INTEGER NOT NULL,
+    diet_types_analyzed INTEGER NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (processed_at);
+
+CREATE TABLE IF NOT EXISTS diet_results (
+    diet_type TEXT NOT NULL,
+    processed_at TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    recipe_count INTEGER,
+    protein_mean REAL,
+    carbs_mean REAL,
+    fat_mean REAL,
+    protein_std REAL,
+    carbs_std REAL,
+    fat_std REAL,
+    PRIMARY KEY (diet_type, processed_at, run_id)
+) WITHOUT ROWID;
+"""
+
+
+class ResultsStore:
+    """
+    SQLite-backed, append-only history of processing results
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append_run(self, result):
+        """
+        Append one result document from process_nutritional_data_from_azurite.
+
+        Returns:
+            int: The new run_id
+        """
+        processed_at = result["processing_timestamp"]
+        stats = result.get("macronutrient_stats", {})
+        counts = result.get("recipe_counts", {})
+
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (processed_at, total_records, diet_types_analyzed, document) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    processed_at,
+                    result["total_records_processed"],
+                    result["diet_types_analyzed"],
+                    json.dumps(result),
+                ),
+            )
+            run_id = cursor.lastrowid
+
+            rows = []
+            for record in result["average_macronutrients"]:
+                diet = record[DIET_COLUMN]
+                diet_stats = stats.get(diet, {})
+                rows.append(
+                    (
+                        diet,
+                        processed_at,
+                        run_id,
+                        counts.get(diet),
+                        *(record[col] for col in MACRO_COLUMNS),
+                        *(diet_stats.get(col, {}).get("std") for col in MACRO_COLUMNS),
+                    )
+                )
+            self._conn.executemany(
+                "INSERT INTO diet_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return run_id
+
+    def latest_per_diet(self):
+        """
+        The most recent result row for every diet type.
+
+        Returns:
+            list: dicts with diet_type, processed_at, run_id, recipe_count and
+                  the mean/std per macronutrient
+        """
+        cursor = self._conn.execute(
+            "SELECT d.* FROM diet_results AS d "
+            "JOIN (SELECT diet_type, MAX(processed_at) AS latest "
+            "      FROM diet_results GROUP BY diet_type) AS l "
+            "ON d.diet_type = l.diet_type AND d.processed_at = l.latest "
+            "ORDER BY d.diet_type"
+        )
+        return [dict(row) for row in cursor]
+
+    def trend(self, diet_type, macro="Protein(g)", limit=None):
+        """
+        Mean of one macronutrient for a diet across runs, oldest first.
+
+        Args:
+            diet_type: Diet to look up (e.g. "keto")
+            macro: "Protein(g)", "Carbs(g)" or "Fat(g)"
+            limit: Only the most recent N runs
+
+        Returns:
+            list: (processed_at, mean) tuples
+        """
+        column = f"{MACRO_FIELDS[macro]}_mean"
+        query = (
+            f"SELECT processed_at, {column} FROM diet_results "
+            "WHERE diet_type = ? ORDER BY processed_at DESC"
+        )
+        params = [diet_type]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self._conn.execute(query, params).fetchall()
+        return [(row[0], row[1]) for row in reversed(rows)]
+
+    def run(self, run_id):
+        """
+        The full result document of one run, or None.
+        """
+        row = self._conn.execute(
+            "SELECT document FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        return json.loads(row["document"]) if row else None
+
+    def latest_run(self):
+        """
+        The most recent run as (run_id, result document), or None.
+        """
+        row = self._conn.execute(
+            "SELECT run_id, document FROM runs ORDER BY processed_at DESC LIMIT 1"
+        ).fetchone()
+        return (row["run_id"], json.loads(row["document"])) if row else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query stored nutritional results")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("latest", help="Latest result per diet type")
+    trend_parser = commands.add_parser("trend", help="Macronutrient mean over runs")
+    trend_parser.add_argument("diet_type")
+    trend_parser.add_argument("--macro", choices=MACRO_COLUMNS, default="Protein(g)")
+    trend_parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.command == "latest":
+            for row in store.latest_per_diet():
+                print(
+                    f"{row['diet_type']:<15} {row['processed_at']}  "
+                    f"protein={row['protein_mean']:.2f} carbs={row['carbs_mean']:.2f} "
+                    f"fat={row['fat_mean']:.2f}"
+                )
+        else:
+            for processed_at, mean in store.trend(
+                args.diet_type, args.macro, args.limit
+            ):
+                print(f"{processed_at}  {mean:.2f}")
+
+
+if __name__ == "__main__":
+    main()
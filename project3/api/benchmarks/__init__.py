@@ -0,0 +1,13 @@
+"""
+Micro-benchmarks for the API's data functions.
+
+Run from project3/api:
+
+    python -m benchmarks.bench_data_functions                # 1x, 10x, 100x, 1000x
+    python -m benchmarks.bench_data_functions --scales 1 10  # quick run
+    python -m benchmarks.compare base.json head.json         # compare two runs
+    python -m benchmarks.generate_dataset --rows 5000000 --output /tmp/diets_5m
+    python -m benchmarks.memory_report                       # dtype memory savings
+
+Results are written as JSON under benchmarks/results/ (git-ignored).
+"""
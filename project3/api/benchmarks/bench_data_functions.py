@@ -0,0 +1,221 @@
+"""
+Benchmark the data functions against All_Diets.csv and synthetic datasets
+10x-1000x its size (see synthetic.py).
+
+Each case is timed over several repeats (after one warm-up call), then run
+once more under tracemalloc to record its peak Python memory.
+
+The datasets are written to a temporary directory, which load_dataset reads
+through DATASETS_DIR, so nothing is ever left in functions/datasets.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Benchmarks always read the local dataset files, and load_dataset is timed
+# as a full read and parse rather than a snapshot lookup
+os.environ.pop("AZURE_STORAGE_CONNECTION_STRING", None)
+os.environ["DATASET_REFRESH_INTERVAL"] = "0"
+
+# Removed when the process exits, including after Ctrl-C
+SCRATCH_DIR = tempfile.TemporaryDirectory(prefix="bench-datasets-")
+os.environ["DATASETS_DIR"] = SCRATCH_DIR.name
+
+# Imported after the environment above is set, which these modules read at import
+from functions import get_clusters, get_nutritional_insights, get_recipes  # noqa: E402
+from functions.utils import filter_by_diet_type, load_dataset  # noqa: E402
+from functions.utils.schema import read_dataset_csv  # noqa: E402
+
+from .synthetic import DatasetModel, write_dataset  # noqa: E402
+
+API_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DIR = API_DIR / "functions" / "datasets"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BASE_DATASET = "All_Diets.csv"
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+PERCENTILES = (50, 90, 95, 99)
+
+CASES = {
+    "load_dataset": lambda path, df: load_dataset(path.name),
+    "filter_by_diet_type": lambda path, df: filter_by_diet_type(df, "keto"),
+    "get_nutritional_insights": lambda path, df: get_nutritional_insights("all", df=df),
+    "get_recipes": lambda path, df: get_recipes("keto", 1, 20, df=df),
+    "get_clusters": lambda path, df: get_clusters("all", 3, df=df),
+}
+
+
+def repeats_for(scale, repeat):
+    # Keep large scales affordable; small ones get enough samples for p99
+    return max(3, repeat // scale) if scale > 1 else repeat
+
+
+def time_case(run, repeat):
+    run()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def peak_memory_kb(run):
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def summarize(samples):
+    values = np.asarray(samples)
+    summary = {f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    summary.update(
+        min=round(float(values.min()), 3),
+        max=round(float(values.max()), 3),
+        mean=round(float(values.mean()), 3),
+    )
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=API_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_dataset(model, base_rows, scale, seed):
+    """
+    Write the dataset for a scale into the scratch directory
+
+    Returns:
+        Path: CSV path; its name is what load_dataset is given
+    """
+    path = Path(SCRATCH_DIR.name) / (
+        BASE_DATASET if scale == 1 else f"bench_x{scale}.csv"
+    )
+    if scale == 1:
+        shutil.copyfile(SOURCE_DIR / BASE_DATASET, path)
+    else:
+        write_dataset(path, base_rows * scale, seed=seed, model=model)
+    return path
+
+
+def run(scales, repeat, functions, seed=0):
+    base_rows = len(pd.read_csv(SOURCE_DIR / BASE_DATASET))
+    model = DatasetModel.from_csv(SOURCE_DIR / BASE_DATASET)
+    results = []
+
+    for scale in scales:
+        path = prepare_dataset(model, base_rows, scale, seed)
+        try:
+            # Parsed like load_dataset does, so the cases see production dtypes
+            df = read_dataset_csv(path)
+            for name in functions:
+                case = CASES[name]
+
+                def call():
+                    return case(path, df)
+
+                n = repeats_for(scale, repeat)
+                samples = time_case(call, n)
+                result = {
+                    "function": name,
+                    "scale": scale,
+                    "rows": len(df),
+                    "repeat": n,
+                    "latency_ms": summarize(samples),
+                    "peak_memory_kb": peak_memory_kb(call),
+                }
+                results.append(result)
+                print(
+                    f"{name:<26} x{scale:<5} rows={len(df):<9} "
+                    f"p50={result['latency_ms']['p50']:>10.2f}ms "
+                    f"p99={result['latency_ms']['p99']:>10.2f}ms "
+                    f"peak={result['peak_memory_kb'] / 1024:>8.1f}MB",
+                    flush=True,
+                )
+        finally:
+            # Free the disk before the next, larger scale
+            path.unlink(missing_ok=True)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SCALES),
+        help="Dataset size multipliers (default: 1 10 100 1000)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=30, help="Timed runs at 1x (default: 30)"
+    )
+    parser.add_argument(
+        "--functions",
+        nargs="+",
+        choices=sorted(CASES),
+        default=list(CASES),
+        help="Functions to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Synthetic dataset seed (default: 0)"
+    )
+    parser.add_argument("--output", type=Path, help="Results JSON path")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    started = datetime.utcnow()
+    results = run(args.scales, args.repeat, args.functions, args.seed)
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": started.isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        f"bench-{commit or 'nogit'}-{started:%Y%m%d%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare base.json head.json [--metric p50] [--threshold 10]
+
+Prints the change per function and scale and exits with status 1 if any case
+slowed down by more than the threshold percentage.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path) as f:
+        report = json.load(f)
+    results = {(r["function"], r["scale"]): r for r in report["results"]}
+    return report["meta"], results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument(
+        "--metric", default="p50", help="Latency statistic to compare (default: p50)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Regression threshold in percent (default: 10)",
+    )
+    args = parser.parse_args(argv)
+
+    base_meta, base = load_results(args.base)
+    head_meta, head = load_results(args.head)
+    print(f"base: {base_meta.get('commit')}  head: {head_meta.get('commit')}")
+    print(
+        f"{'function':<26} {'scale':>6} {'base ms':>12} {'head ms':>12} "
+        f"{'change':>8} {'peak MB':>16}"
+    )
+
+    regressions = 0
+    for key in sorted(set(base) & set(head)):
+        before = base[key]["latency_ms"][args.metric]
+        after = head[key]["latency_ms"][args.metric]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        memory = (
+            f"{base[key]['peak_memory_kb'] / 1024:.1f}"
+            f"->{head[key]['peak_memory_kb'] / 1024:.1f}"
+        )
+        print(
+            f"{key[0]:<26} {key[1]:>6} {before:>12.2f} {after:>12.2f} "
+            f"{change:>+7.1f}% {memory:>16}{flag}"
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
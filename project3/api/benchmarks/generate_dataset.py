@@ -0,0 +1,74 @@
+"""
+Generate a synthetic dataset shaped like All_Diets.csv.
+
+    python -m benchmarks.generate_dataset --rows 5000000 --output /tmp/diets_5m --format csv parquet
+
+Rows are streamed to disk in chunks, so memory stays constant regardless of
+--rows; the same --seed and --chunk-rows always produce the same file.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from .synthetic import DEFAULT_CHUNK_ROWS, WRITERS, DatasetModel, write_dataset
+
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, required=True, help="Rows to generate")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Output path; the extension is set per format",
+    )
+    parser.add_argument(
+        "--format",
+        nargs="+",
+        choices=sorted(WRITERS),
+        default=["csv"],
+        help="Output formats (default: csv)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=f"Rows per generated chunk (default: {DEFAULT_CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        nargs="+",
+        default=[],
+        help="CSVs to learn distributions from (default: All_Diets.csv)",
+    )
+    args = parser.parse_args(argv)
+
+    model = DatasetModel.from_csv(*args.source)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    for fmt in args.format:
+        path = args.output.with_suffix(EXTENSIONS[fmt])
+        started = time.perf_counter()
+        written = write_dataset(
+            path,
+            args.rows,
+            fmt,
+            seed=args.seed,
+            chunk_rows=args.chunk_rows,
+            model=model,
+        )
+        elapsed = time.perf_counter() - started
+        print(
+            f"Wrote {written} rows to {path} in {elapsed:.1f}s "
+            f"({path.stat().st_size / 1024**2:.1f} MB)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
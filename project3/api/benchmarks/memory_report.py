@@ -0,0 +1,46 @@
+"""
+Report dataset memory with pandas' default dtypes versus the lean schema.
+
+    python -m benchmarks.memory_report                       # All_Diets.csv
+    python -m benchmarks.memory_report /tmp/diets_5m.csv
+    python -m benchmarks.memory_report --columns insights    # one consumer's projection
+
+Prints the deep memory of every column under both schemas.
+"""
+
+import argparse
+import json
+
+from functions.utils.schema import CLUSTER_COLUMNS, INSIGHTS_COLUMNS, memory_report
+
+from .synthetic import SOURCE_DATASET
+
+PROJECTIONS = {"all": None, "insights": INSIGHTS_COLUMNS, "clusters": CLUSTER_COLUMNS}
+
+
+def format_report(report):
+    default, schema = report["default"], report["schema"]
+    lines = [f"{'column':<18} {'default MB':>12} {'schema MB':>12} {'saved':>8}"]
+    for column in default:
+        before = default[column]
+        after = schema.get(column, 0)
+        saved = (1 - after / before) * 100 if before else 0.0
+        lines.append(
+            f"{column:<18} {before / 1e6:>12.2f} {after / 1e6:>12.2f} {saved:>7.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default=str(SOURCE_DATASET))
+    parser.add_argument("--columns", choices=sorted(PROJECTIONS), default="all")
+    parser.add_argument("--json", action="store_true", help="Print the raw report")
+    args = parser.parse_args(argv)
+
+    report = memory_report(args.path, PROJECTIONS[args.columns])
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Synthetic datasets that scale All_Diets.csv while preserving its distributions.
+
+DatasetModel learns, per diet type:
+- the diet mix (share of rows),
+- the joint Protein/Carbs/Fat distribution, as a smoothed bootstrap in
+  log1p space (resample a real recipe, add Gaussian noise shaped by the
+  diet's covariance), which keeps skew and macro correlations,
+- the cuisine mix, drawn together with the resampled recipe so cuisine and
+  macros stay correlated,
+- the recipe-name vocabulary and name-length distribution.
+
+generate_chunks() then streams fixed-size DataFrame chunks from the model, so
+millions of rows can be written with memory bounded by the chunk size. The
+same seed and chunk size always produce the same rows.
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MACRO_COLUMNS = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+COLUMNS = [
+    "Diet_type",
+    "Recipe_name",
+    "Cuisine_type",
+    *MACRO_COLUMNS,
+    "Extraction_day",
+    "Extraction_time",
+]
+DEFAULT_CHUNK_ROWS = 100_000
+SOURCE_DATASET = (
+    Path(__file__).resolve().parent.parent / "functions" / "datasets" / "All_Diets.csv"
+)
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z'&-]*")
+
+
+def _frequencies(values):
+    values, counts = np.unique(np.asarray(values), return_counts=True)
+    return values, counts / counts.sum()
+
+
+class DietModel:
+    """
+    Learned distributions for the recipes of one diet type
+    """
+
+    def __init__(self, df):
+        self.log_macros = np.log1p(df[MACRO_COLUMNS].to_numpy(dtype=float))
+        self.cuisines = df["Cuisine_type"].to_numpy(dtype=object)
+
+        # Silverman's rule of thumb bandwidth for a 3-dimensional KDE
+        n, dims = self.log_macros.shape
+        bandwidth = n ** (-1 / (dims + 4))
+        covariance = np.atleast_2d(np.cov(self.log_macros, rowvar=False))
+        if n < 2 or not np.all(np.isfinite(covariance)):
+            covariance = np.zeros((dims, dims))
+        # Tiny ridge keeps the factorization stable for degenerate columns
+        self.noise = np.linalg.cholesky(covariance * bandwidth**2 + np.eye(dims) * 1e-9)
+
+        tokenized = [_WORD.findall(name) for name in df["Recipe_name"].astype(str)]
+        self.name_lengths, self.name_length_p = _frequencies(
+            [max(1, len(words)) for words in tokenized]
+        )
+        self.vocabulary, self.vocabulary_p = _frequencies(
+            [word.capitalize() for words in tokenized for word in words] or ["Recipe"]
+        )
+
+    def sample(self, n, rng):
+        """
+        Returns:
+            tuple: (names, cuisines, macros) arrays of length n
+        """
+        rows = rng.integers(0, len(self.log_macros), size=n)
+        jitter = rng.standard_normal((n, self.log_macros.shape[1])) @ self.noise.T
+        macros = np.clip(np.expm1(self.log_macros[rows] + jitter), 0, None).round(2)
+
+        lengths = rng.choice(self.name_lengths, size=n, p=self.name_length_p)
+        words = rng.choice(
+            self.vocabulary, size=int(lengths.sum()), p=self.vocabulary_p
+        )
+        ends = np.cumsum(lengths)
+        names = [
+            " ".join(words[end - length : end]) for end, length in zip(ends, lengths)
+        ]
+
+        return np.asarray(names, dtype=object), self.cuisines[rows], macros
+
+
+class DatasetModel:
+    """
+    Per-diet distributions learned from one or more dataset CSVs
+    """
+
+    def __init__(self, df):
+        self.diets, self.diet_p = _frequencies(df["Diet_type"])
+        self.models = {
+            diet: DietModel(df[df["Diet_type"] == diet]) for diet in self.diets
+        }
+        self.extractions = (
+            df[["Extraction_day", "Extraction_time"]]
+            .drop_duplicates()
+            .to_numpy(dtype=object)
+        )
+
+    @classmethod
+    def from_csv(cls, *paths):
+        """
+        Learn a model from one or more CSVs with the All_Diets.csv columns
+        """
+        paths = paths or (SOURCE_DATASET,)
+        return cls(pd.concat([pd.read_csv(path) for path in paths], ignore_index=True))
+
+    def sample(self, n, rng):
+        """
+        Draw n synthetic recipes
+
+        Returns:
+            pandas.DataFrame: Rows with the All_Diets.csv columns
+        """
+        diet_index = rng.choice(len(self.diets), size=n, p=self.diet_p)
+        names = np.empty(n, dtype=object)
+        cuisines = np.empty(n, dtype=object)
+        macros = np.empty((n, len(MACRO_COLUMNS)))
+
+        for i, diet in enumerate(self.diets):
+            mask = diet_index == i
+            count = int(mask.sum())
+            if count:
+                names[mask], cuisines[mask], macros[mask] = self.models[diet].sample(
+                    count, rng
+                )
+
+        extraction = self.extractions[rng.integers(0, len(self.extractions), size=n)]
+        return pd.DataFrame(
+            {
+                "Diet_type": self.diets[diet_index],
+                "Recipe_name": names,
+                "Cuisine_type": cuisines,
+                **{column: macros[:, j] for j, column in enumerate(MACRO_COLUMNS)},
+                "Extraction_day": extraction[:, 0],
+                "Extraction_time": extraction[:, 1],
+            },
+            columns=COLUMNS,
+        )
+
+
+def generate_chunks(model, rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream synthetic rows as DataFrame chunks
+
+    Args:
+        model: DatasetModel to sample from
+        rows: Total number of rows
+        seed: Random seed
+        chunk_rows: Rows per chunk; bounds memory use
+
+    Yields:
+        pandas.DataFrame: Chunks of at most chunk_rows rows
+    """
+    rng = np.random.default_rng(seed)
+    remaining = rows
+    while remaining > 0:
+        n = min(chunk_rows, remaining)
+        yield model.sample(n, rng)
+        remaining -= n
+
+
+def write_csv(chunks, path):
+    """
+    Write chunks to one CSV file
+
+    Returns:
+        int: Rows written
+    """
+    written = 0
+    with open(path, "w", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=i == 0)
+            written += len(chunk)
+    return written
+
+
+def write_parquet(chunks, path):
+    """
+    Write chunks to one Parquet file, one row group per chunk (requires pyarrow)
+
+    Returns:
+        int: Rows written
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(
+            "Parquet output requires pyarrow (pip install pyarrow)"
+        ) from e
+
+    written = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def write_dataset(
+    path, rows, fmt="csv", seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, model=None
+):
+    """
+    Generate a synthetic dataset straight to disk
+
+    Args:
+        path: Output file path
+        rows: Number of rows
+        fmt: "csv" or "parquet"
+        seed: Random seed
+        chunk_rows: Rows generated and written at a time
+        model: DatasetModel to sample from (default: learned from All_Diets.csv)
+
+    Returns:
+        int: Rows written
+    """
+    model = model or DatasetModel.from_csv()
+    return WRITERS[fmt](generate_chunks(model, rows, seed, chunk_rows), path)
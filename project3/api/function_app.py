@@ -1,6 +1,4 @@
 import azure.functions as func
-import json
-from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -11,6 +9,8 @@ from functions import (
     get_nutritional_insights,
     get_recipes,
     get_clusters,
+    get_dashboard,
+    run_batch,
     get_security_status,
     get_oauth_login_url,
     handle_oauth_callback,
@@ -19,11 +19,39 @@ from functions import (
     list_resources_in_group,
     delete_resources,
 )
+from functions.utils import UnknownDatasetError, resolve_dataset
+from functions.utils.dataset_registry import DEFAULT_DATASET
+from functions.utils.dataset_utils import dataset_registry
+from functions.utils.response_utils import json_response, error_response
+from functions.utils.middleware import http_handler
+from functions.utils.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from functions.utils.profiling import is_admin, load_profile
+from functions.utils.http_cache import (
+    data_cache_headers,
+    is_not_modified,
+    not_modified_response,
+)
 
 app = func.FunctionApp()
 
 
+def resolve_request_dataset(req: func.HttpRequest):
+    """
+    Resolve the request's dataset query parameter to a dataset filename
+
+    Returns:
+        tuple: (filename, None), or (None, 400/404 error response)
+    """
+    try:
+        return resolve_dataset(req.params.get("dataset")), None
+    except UnknownDatasetError as e:
+        return None, json_response({"error": str(e)}, status_code=404, req=req)
+    except ValueError as e:
+        return None, json_response({"error": str(e)}, status_code=400, req=req)
+
+
 @app.route(route="greeting")
+@http_handler("greeting")
 def http_greeting(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that calls greeting function
@@ -34,23 +62,32 @@ def http_greeting(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="nutritional-insights")
+@http_handler("nutritional-insights")
 def http_nutritional_insights(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that returns nutritional insights for a diet type
+
+    Query Parameters:
+        - diet_type: (optional) "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
+                     Defaults to "all" if not provided
+        - dataset: (optional) Dataset to read (see /datasets), defaults to All_Diets
     """
-    try:
-        diet_type = req.params.get("diet_type", "all")
-        result = get_nutritional_insights(diet_type)
-        return func.HttpResponse(
-            json.dumps(result), status_code=200, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}), status_code=500, mimetype="application/json"
-        )
+    filename, error = resolve_request_dataset(req)
+    if error is not None:
+        return error
+
+    # Answer conditional requests before loading or computing anything
+    cache_headers = data_cache_headers(req, "nutritional-insights", filename)
+    if is_not_modified(req, cache_headers["ETag"]):
+        return not_modified_response(cache_headers, req)
+
+    diet_type = req.params.get("diet_type", "all")
+    result = get_nutritional_insights(diet_type, filename=filename)
+    return json_response(result, status_code=200, req=req, headers=cache_headers)
 
 
 @app.route(route="recipes")
+@http_handler("recipes")
 def http_recipes(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that returns recipes filtered by diet type with pagination
@@ -60,22 +97,26 @@ def http_recipes(req: func.HttpRequest) -> func.HttpResponse:
                      Defaults to "all" if not provided
         - page: (optional) Page number (1-indexed), defaults to 1
         - page_size: (optional) Number of recipes per page, defaults to 20
+        - dataset: (optional) Dataset to read (see /datasets), defaults to All_Diets
     """
-    try:
-        diet_type = req.params.get("diet_type", "all")
-        page = req.params.get("page", "1")
-        page_size = req.params.get("page_size", "20")
-        result = get_recipes(diet_type, page, page_size)
-        return func.HttpResponse(
-            json.dumps(result), status_code=200, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}), status_code=500, mimetype="application/json"
-        )
+    filename, error = resolve_request_dataset(req)
+    if error is not None:
+        return error
+
+    # Answer conditional requests before loading or computing anything
+    cache_headers = data_cache_headers(req, "recipes", filename)
+    if is_not_modified(req, cache_headers["ETag"]):
+        return not_modified_response(cache_headers, req)
+
+    diet_type = req.params.get("diet_type", "all")
+    page = req.params.get("page", "1")
+    page_size = req.params.get("page_size", "20")
+    result = get_recipes(diet_type, page, page_size, filename=filename)
+    return json_response(result, status_code=200, req=req, headers=cache_headers)
 
 
 @app.route(route="clusters")
+@http_handler("clusters")
 def http_clusters(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that returns nutritional clusters for recipes
@@ -84,21 +125,144 @@ def http_clusters(req: func.HttpRequest) -> func.HttpResponse:
         - diet_type: (optional) "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
                      Defaults to "all" if not provided
         - num_clusters: (optional) Number of clusters to create, defaults to 3 (max 20)
+        - dataset: (optional) Dataset to read (see /datasets), defaults to All_Diets
     """
+    filename, error = resolve_request_dataset(req)
+    if error is not None:
+        return error
+
+    # Answer conditional requests before loading or computing anything
+    cache_headers = data_cache_headers(req, "clusters", filename)
+    if is_not_modified(req, cache_headers["ETag"]):
+        return not_modified_response(cache_headers, req)
+
+    diet_type = req.params.get("diet_type", "all")
+    num_clusters = req.params.get("num_clusters", "3")
+    result = get_clusters(diet_type, num_clusters, filename=filename)
+    return json_response(result, status_code=200, req=req, headers=cache_headers)
+
+
+@app.route(route="dashboard")
+@http_handler("dashboard")
+def http_dashboard(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    HTTP triggered function that returns insights, a page of recipes and clusters
+    computed from a single dataset load
+
+    Query Parameters:
+        - diet_type: (optional) "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
+                     Defaults to "all" if not provided
+        - page: (optional) Recipe page number (1-indexed), defaults to 1
+        - page_size: (optional) Number of recipes per page, defaults to 20
+        - num_clusters: (optional) Number of clusters to create, defaults to 3 (max 20)
+        - dataset: (optional) Dataset to read (see /datasets), defaults to All_Diets
+    """
+    filename, error = resolve_request_dataset(req)
+    if error is not None:
+        return error
+
+    # Answer conditional requests before loading or computing anything
+    cache_headers = data_cache_headers(req, "dashboard", filename)
+    if is_not_modified(req, cache_headers["ETag"]):
+        return not_modified_response(cache_headers, req)
+
+    diet_type = req.params.get("diet_type", "all")
+    page = req.params.get("page", "1")
+    page_size = req.params.get("page_size", "20")
+    num_clusters = req.params.get("num_clusters", "3")
+    result = get_dashboard(diet_type, page, page_size, num_clusters, filename=filename)
+    return json_response(result, status_code=200, req=req, headers=cache_headers)
+
+
+@app.route(route="batch", methods=["POST"])
+@http_handler("batch")
+def http_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    HTTP triggered function that runs several data sub-requests in one call
+    against a shared dataset load
+
+    Request body:
+        [
+            {"id": "a", "route": "recipes", "params": {"diet_type": "keto", "page": 2}},
+            {"id": "b", "route": "clusters", "params": {"num_clusters": 4}}
+        ]
+
+    Query Parameters:
+        - dataset: (optional) Dataset for sub-requests without a "dataset" param,
+                   defaults to All_Diets
+
+    Returns:
+        - count: Number of sub-requests
+        - succeeded: Number of sub-requests with status 200
+        - results: Per sub-request index, id, route, status and body
+    """
+    filename, error = resolve_request_dataset(req)
+    if error is not None:
+        return error
+
     try:
-        diet_type = req.params.get("diet_type", "all")
-        num_clusters = req.params.get("num_clusters", "3")
-        result = get_clusters(diet_type, num_clusters)
-        return func.HttpResponse(
-            json.dumps(result), status_code=200, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}), status_code=500, mimetype="application/json"
+        sub_requests = req.get_json()
+    except ValueError:
+        return json_response(
+            {"error": "Request body must be valid JSON"}, status_code=400, req=req
         )
 
+    try:
+        result = run_batch(sub_requests, filename)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status_code=400, req=req)
+    return json_response(result, status_code=200, req=req)
+
+
+@app.route(route="datasets", methods=["GET"])
+@http_handler("datasets")
+def http_datasets(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    HTTP triggered function that lists the datasets the data endpoints accept
+    in their dataset parameter
+    """
+    return json_response(
+        {"default": DEFAULT_DATASET, "datasets": dataset_registry.names()},
+        status_code=200,
+        req=req,
+    )
+
+
+@app.route(route="metrics", methods=["GET"])
+@http_handler("metrics")
+def http_metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    HTTP triggered function that exposes in-process metrics in the Prometheus
+    text format: per-route and per-stage latency histograms, dataset load
+    durations, row counts and the current dataset version
+    """
+    return func.HttpResponse(
+        registry.render(),
+        status_code=200,
+        headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+    )
+
+
+@app.route(route="profiles/{profile_id}", methods=["GET"])
+@http_handler("profiles")
+def http_profile(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    HTTP triggered function that returns a stored request profile
+
+    Requires the X-Profile-Token admin header. The profile id comes from the
+    X-Profile-Id header of a profiled response.
+    """
+    if not is_admin(req):
+        return json_response({"error": "Forbidden"}, status_code=403, req=req)
+
+    report = load_profile(req.route_params.get("profile_id"))
+    if report is None:
+        return json_response({"error": "Profile not found"}, status_code=404, req=req)
+    return json_response(report, status_code=200, req=req)
+
 
 @app.route(route="security-status")
+@http_handler("security-status")
 def http_security_status(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that returns the security and compliance status
@@ -108,18 +272,12 @@ def http_security_status(req: func.HttpRequest) -> func.HttpResponse:
         - access_control: Access control status (Secure/Compromised)
         - compliance: Compliance status (Compliant/Non-Compliant)
     """
-    try:
-        result = get_security_status()
-        return func.HttpResponse(
-            json.dumps(result), status_code=200, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}), status_code=500, mimetype="application/json"
-        )
+    result = get_security_status()
+    return json_response(result, status_code=200, req=req)
 
 
 @app.route(route="cleanup/list", methods=["GET"])
+@http_handler("cleanup/list", error_envelope="status")
 def http_cleanup_list(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that lists all resources in the resource group.
@@ -130,27 +288,13 @@ def http_cleanup_list(req: func.HttpRequest) -> func.HttpResponse:
         - resources: List of resources with id, name, type
         - count: Total number of resources
     """
-    try:
-        result = list_resources_in_group()
-        status_code = 200 if result["status"] == "success" else 500
-        return func.HttpResponse(
-            json.dumps(result), status_code=status_code, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps(
-                {
-                    "status": "error",
-                    "message": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            ),
-            status_code=500,
-            mimetype="application/json",
-        )
+    result = list_resources_in_group()
+    status_code = 200 if result["status"] == "success" else 500
+    return json_response(result, status_code=status_code, req=req)
 
 
 @app.route(route="cleanup/delete", methods=["POST"])
+@http_handler("cleanup/delete", error_envelope="status")
 def http_cleanup_delete(req: func.HttpRequest) -> func.HttpResponse:
     """
     HTTP triggered function that deletes selected resources.
@@ -167,130 +311,71 @@ def http_cleanup_delete(req: func.HttpRequest) -> func.HttpResponse:
         - deleted_resources: List of successfully deleted resource IDs
         - failed_resources: List of failed deletions with errors
     """
-    try:
-        # Require confirmation header for safety
-        confirmation = req.headers.get("X-Cleanup-Confirm")
-        if confirmation != "confirmed":
-            return func.HttpResponse(
-                json.dumps(
-                    {
-                        "status": "error",
-                        "message": "Deletion requires confirmation header: X-Cleanup-Confirm: confirmed",
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                ),
-                status_code=400,
-                mimetype="application/json",
-            )
-
-        req_body = req.get_json()
-        resource_ids = req_body.get("resource_ids", [])
-
-        if not resource_ids:
-            return func.HttpResponse(
-                json.dumps(
-                    {
-                        "status": "error",
-                        "message": "No resources specified for deletion",
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                ),
-                status_code=400,
-                mimetype="application/json",
-            )
-
-        result = delete_resources(resource_ids)
-        status_code = 200 if result["status"] in ["success", "partial"] else 500
-        return func.HttpResponse(
-            json.dumps(result), status_code=status_code, mimetype="application/json"
+    # Require confirmation header for safety
+    confirmation = req.headers.get("X-Cleanup-Confirm")
+    if confirmation != "confirmed":
+        return error_response(
+            "Deletion requires confirmation header: X-Cleanup-Confirm: confirmed",
+            status_code=400,
+            req=req,
         )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps(
-                {
-                    "status": "error",
-                    "message": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            ),
-            status_code=500,
-            mimetype="application/json",
+
+    req_body = req.get_json()
+    resource_ids = req_body.get("resource_ids", [])
+
+    if not resource_ids:
+        return error_response(
+            "No resources specified for deletion", status_code=400, req=req
         )
 
+    result = delete_resources(resource_ids)
+    status_code = 200 if result["status"] in ["success", "partial"] else 500
+    return json_response(result, status_code=status_code, req=req)
+
 
 @app.route(route="auth/oauth/login", methods=["GET"])
+@http_handler("auth/oauth/login", error_envelope="status")
 def http_auth_oauth_login(req: func.HttpRequest) -> func.HttpResponse:
     provider = req.params.get("provider", "azure")
     result = get_oauth_login_url(provider)
     status_code = 200 if result.get("status") == "success" else 400
-    return func.HttpResponse(
-        json.dumps(result), status_code=status_code, mimetype="application/json"
-    )
+    return json_response(result, status_code=status_code, req=req)
 
 
 @app.route(route="auth/oauth/callback", methods=["GET"])
+@http_handler("auth/oauth/callback", error_envelope="status")
 def http_auth_oauth_callback(req: func.HttpRequest) -> func.HttpResponse:
     provider = req.params.get("provider", "azure")
     code = req.params.get("code")
     state = req.params.get("state")
     result = handle_oauth_callback(provider, code, state)
     status_code = 200 if result.get("status") == "success" else 400
-    return func.HttpResponse(
-        json.dumps(result), status_code=status_code, mimetype="application/json"
-    )
+    return json_response(result, status_code=status_code, req=req)
 
 
 @app.route(route="auth/2fa-setup", methods=["POST"])
+@http_handler("auth/2fa-setup", error_envelope="status")
 def http_auth_two_factor_setup(req: func.HttpRequest) -> func.HttpResponse:
     try:
-        try:
-            req_body = req.get_json()
-        except ValueError:
-            req_body = {}
-
-        email = req_body.get("email") if isinstance(req_body, dict) else None
-        result = setup_two_factor(email)
-        status_code = 200 if result.get("status") == "success" else 400
-        return func.HttpResponse(
-            json.dumps(result), status_code=status_code, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps(
-                {
-                    "status": "error",
-                    "message": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            ),
-            status_code=500,
-            mimetype="application/json",
-        )
+        req_body = req.get_json()
+    except ValueError:
+        req_body = {}
+
+    email = req_body.get("email") if isinstance(req_body, dict) else None
+    result = setup_two_factor(email)
+    status_code = 200 if result.get("status") == "success" else 400
+    return json_response(result, status_code=status_code, req=req)
 
 
 @app.route(route="auth/2fa-verify", methods=["POST"])
+@http_handler("auth/2fa-verify", error_envelope="status")
 def http_auth_two_factor_verify(req: func.HttpRequest) -> func.HttpResponse:
     try:
-        try:
-            req_body = req.get_json()
-        except ValueError:
-            req_body = {}
-
-        code = req_body.get("code") if isinstance(req_body, dict) else None
-        result = verify_two_factor(code)
-        status_code = 200 if result.get("status") == "success" else 400
-        return func.HttpResponse(
-            json.dumps(result), status_code=status_code, mimetype="application/json"
-        )
-    except Exception as e:
-        return func.HttpResponse(
-            json.dumps(
-                {
-                    "status": "error",
-                    "message": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            ),
-            status_code=500,
-            mimetype="application/json",
-        )
+        req_body = req.get_json()
+    except ValueError:
+        req_body = {}
+
+    code = req_body.get("code") if isinstance(req_body, dict) else None
+    result = verify_two_factor(code)
+    status_code = 200 if result.get("status") == "success" else 400
+    return json_response(result, status_code=status_code, req=req)
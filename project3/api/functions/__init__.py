@@ -6,6 +6,7 @@ Exports all endpoint handler functions and utility functions for:
 - Nutritional data analysis and insights
 - Recipe fetching with pagination
 - K-means clustering of recipes
+- Composite dashboard payload and batched sub-requests
 - Security and compliance status
 - Authentication (OAuth and 2FA)
 - Resource cleanup management
@@ -15,6 +16,8 @@ from .greeting import greeting
 from .nutritional_insights import get_nutritional_insights
 from .get_recipes import get_recipes
 from .get_clusters import get_clusters
+from .dashboard import get_dashboard
+from .batch import run_batch
 from .security_compliance import get_security_status
 from .auth import (
     get_oauth_login_url,
@@ -30,6 +33,8 @@ __all__ = [
     "get_nutritional_insights",
     "get_recipes",
     "get_clusters",
+    "get_dashboard",
+    "run_batch",
     "get_security_status",
     # Authentication
     "get_oauth_login_url",
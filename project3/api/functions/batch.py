@@ -0,0 +1,159 @@
+"""
+Batch Request Module
+
+This module multiplexes several small data queries into one HTTP call. Each
+sub-request names an existing data route and its query parameters; all of
+them are answered from a single load of each dataset they use and run
+concurrently on a small thread pool, and the response lists one result per
+sub-request in order.
+
+Request Format:
+    [
+        {"id": "a", "route": "recipes", "params": {"diet_type": "keto", "page": 2}},
+        {"id": "b", "route": "nutritional-insights", "params": {"diet_type": "vegan"}}
+    ]
+
+A sub-request may choose its dataset with a "dataset" param; otherwise the
+batch's default dataset is used.
+
+Supported Routes:
+- nutritional-insights
+- recipes
+- clusters
+- dashboard
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from .utils import UnknownDatasetError, load_dataset, resolve_dataset
+from .nutritional_insights import get_nutritional_insights
+from .get_recipes import get_recipes
+from .get_clusters import get_clusters
+from .dashboard import get_dashboard
+
+MAX_BATCH_SIZE = int(os.getenv("BATCH_MAX_SIZE", "50"))
+MAX_BATCH_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+BATCH_ROUTES = {
+    "nutritional-insights": lambda params, df: get_nutritional_insights(
+        params.get("diet_type", "all"), df=df
+    ),
+    "recipes": lambda params, df: get_recipes(
+        params.get("diet_type", "all"),
+        params.get("page", "1"),
+        params.get("page_size", "20"),
+        df=df,
+    ),
+    "clusters": lambda params, df: get_clusters(
+        params.get("diet_type", "all"), params.get("num_clusters", "3"), df=df
+    ),
+    "dashboard": lambda params, df: get_dashboard(
+        params.get("diet_type", "all"),
+        params.get("page", "1"),
+        params.get("page_size", "20"),
+        params.get("num_clusters", "3"),
+        df=df,
+    ),
+}
+
+
+def _sub_request_dataset(sub_request: Any, default: str) -> str:
+    params = sub_request.get("params") if isinstance(sub_request, dict) else None
+    name = params.get("dataset") if isinstance(params, dict) else None
+    return resolve_dataset(name if name is not None else default)
+
+
+def _run_sub_request(
+    index: int, sub_request: Any, frames: Dict[str, Any], default_dataset: str
+) -> Dict[str, Any]:
+    if not isinstance(sub_request, dict):
+        return {
+            "index": index,
+            "status": 400,
+            "body": {"error": "Sub-request must be an object"},
+        }
+
+    route = str(sub_request.get("route", "")).strip("/")
+    params = sub_request.get("params") or {}
+    result = {"index": index, "route": route}
+    if "id" in sub_request:
+        result["id"] = sub_request["id"]
+
+    handler = BATCH_ROUTES.get(route)
+    if handler is None:
+        result.update(status=404, body={"error": f"Unsupported route '{route}'"})
+        return result
+    if not isinstance(params, dict):
+        result.update(status=400, body={"error": "params must be an object"})
+        return result
+
+    try:
+        df = frames[_sub_request_dataset(sub_request, default_dataset)]
+    except UnknownDatasetError as e:
+        result.update(status=404, body={"error": str(e)})
+        return result
+    except ValueError as e:
+        result.update(status=400, body={"error": str(e)})
+        return result
+
+    try:
+        result.update(status=200, body=handler(params, df))
+    except Exception as e:
+        result.update(status=500, body={"error": str(e)})
+    return result
+
+
+def run_batch(sub_requests: List[Any], dataset: str = None) -> Dict[str, Any]:
+    """
+    Run a list of data sub-requests against one snapshot of each dataset.
+
+    Args:
+        sub_requests: List of {"route", "params", optional "id"} objects
+        dataset: Dataset name for sub-requests without a "dataset" param
+
+    Returns:
+        Dictionary with per-item results (index, id, route, status, body) in request order
+
+    Raises:
+        ValueError: If the payload is not a list or exceeds MAX_BATCH_SIZE
+    """
+    if not isinstance(sub_requests, list):
+        raise ValueError("Batch body must be a JSON array of sub-requests")
+    if len(sub_requests) > MAX_BATCH_SIZE:
+        raise ValueError(
+            f"Batch contains {len(sub_requests)} sub-requests (max {MAX_BATCH_SIZE})"
+        )
+
+    # Load each dataset once, on this thread so every sub-request sees the
+    # snapshot pinned for the batch, and share it between its sub-requests
+    frames = {}
+    for sub_request in sub_requests:
+        try:
+            filename = _sub_request_dataset(sub_request, dataset)
+        except (UnknownDatasetError, ValueError):
+            continue
+        if filename not in frames:
+            frames[filename] = load_dataset(filename)
+
+    if len(sub_requests) <= 1:
+        results = [
+            _run_sub_request(index, sub_request, frames, dataset)
+            for index, sub_request in enumerate(sub_requests)
+        ]
+    else:
+        workers = min(MAX_BATCH_WORKERS, len(sub_requests))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    lambda item: _run_sub_request(item[0], item[1], frames, dataset),
+                    enumerate(sub_requests),
+                )
+            )
+
+    return {
+        "count": len(results),
+        "succeeded": sum(1 for result in results if result["status"] == 200),
+        "results": results,
+    }
@@ -1,12 +1,40 @@
 """
 Azure Blob Storage utility for reading CSV datasets
+
+Downloads are split into BLOB_RANGE_SIZE range requests fetched
+BLOB_MAX_CONCURRENCY at a time, and written to a disk cache under
+BLOB_CACHE_DIR keyed by the blob's ETag. A restarted worker, or another
+worker on the same host, reads the cached file instead of downloading the
+blob again. Setting BLOB_CACHE_DIR to an empty string disables the cache.
 """
 
-import os
+import glob
+import hashlib
 import io
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
 import pandas as pd
+from azure.core import MatchConditions
 from azure.storage.blob import BlobServiceClient
-from utils.keyvault_utils import get_secret_with_fallback
+from .utils.keyvault_utils import get_secret_with_fallback
+from .utils.metrics import registry
+from .utils.schema import read_dataset_csv
+
+logger = logging.getLogger(__name__)
+
+BLOB_MAX_CONCURRENCY = int(os.getenv("BLOB_MAX_CONCURRENCY", "4"))
+BLOB_RANGE_SIZE = int(os.getenv("BLOB_RANGE_SIZE", str(4 * 1024 * 1024)))
+BLOB_CACHE_DIR = os.getenv(
+    "BLOB_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "nutritional-insights-blob-cache"),
+)
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
 
 
 def get_blob_service_client():
@@ -29,12 +57,65 @@ def get_blob_service_client():
             "AZURE_STORAGE_CONNECTION_STRING not found in Key Vault or environment variable"
         )
 
-    print("[BLOB STORAGE] Connection string found, connecting to Azure...")
-    return BlobServiceClient.from_connection_string(connection_string)
+    logger.info("Connection string found, connecting to Azure...")
+    # Blobs larger than one range are fetched as parallel range requests
+    return BlobServiceClient.from_connection_string(
+        connection_string,
+        max_single_get_size=BLOB_RANGE_SIZE,
+        max_chunk_get_size=BLOB_RANGE_SIZE,
+    )
+
+
+def cache_path(container_name: str, blob_name: str, etag: str) -> Path:
+    """
+    Disk cache location for one version of a blob
+
+    The file name keeps a readable form of the blob name, a hash of the full
+    container/blob path (so distinct blobs never collide after sanitizing)
+    and the ETag.
+    """
+    version = _UNSAFE_CHARS.sub("_", etag.strip('"'))
+    return Path(BLOB_CACHE_DIR) / f"{_cache_prefix(container_name, blob_name)}{version}"
+
+
+def _cache_prefix(container_name: str, blob_name: str) -> str:
+    key = hashlib.sha256(f"{container_name}/{blob_name}".encode("utf-8")).hexdigest()
+    readable = _UNSAFE_CHARS.sub("_", blob_name)[-64:]
+    return f"{readable}.{key[:16]}."
+
+
+def _download(blob_client, etag: str, target) -> None:
+    # Pin the download to the ETag we looked up, so a concurrent upload
+    # cannot be cached under the old version's key
+    downloader = blob_client.download_blob(
+        etag=etag,
+        match_condition=MatchConditions.IfNotModified,
+        max_concurrency=BLOB_MAX_CONCURRENCY,
+    )
+    downloader.readinto(target)
+
+
+def _download_to_cache(blob_client, path: Path, etag: str, prefix: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file in the same directory and rename it into
+    # place, so readers never see a partial download
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".download-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _download(blob_client, etag, f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    # Older versions of the same blob are no longer needed
+    for stale in path.parent.glob(f"{glob.escape(prefix)}*"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
 
 
 def read_csv_from_blob(
-    blob_name: str, container_name: str = "datasets"
+    blob_name: str, container_name: str = "datasets", columns=None
 ) -> pd.DataFrame:
     """
     Read a CSV file from Azure Blob Storage and return as pandas DataFrame
@@ -42,6 +123,7 @@ def read_csv_from_blob(
     Args:
         blob_name: Name of the blob file (e.g., "All_Diets.csv")
         container_name: Name of the container (default: "datasets")
+        columns: Optional columns to parse; None parses all (see schema.py)
 
     Returns:
         pandas.DataFrame: The CSV data
@@ -50,22 +132,112 @@ def read_csv_from_blob(
         ValueError: If connection string is not set
         Exception: If blob download fails
     """
-    try:
-        blob_service_client = get_blob_service_client()
-        blob_client = blob_service_client.get_blob_client(
-            container=container_name, blob=blob_name
+    return read_csv_from_blob_with_etag(blob_name, container_name, columns)[0]
+
+
+def read_csv_from_blob_with_etag(
+    blob_name: str, container_name: str = "datasets", columns=None
+) -> tuple:
+    """
+    Read a CSV blob together with the ETag of the version that was read
+
+    Returns:
+        tuple: (pandas.DataFrame, ETag without surrounding quotes)
+    """
+    blob_service_client = get_blob_service_client()
+    blob_client = blob_service_client.get_blob_client(
+        container=container_name, blob=blob_name
+    )
+    etag = blob_client.get_blob_properties().etag
+
+    if not BLOB_CACHE_DIR:
+        started = time.perf_counter()
+        buffer = io.BytesIO()
+        _download(blob_client, etag, buffer)
+        _observe_download(blob_name, started)
+        buffer.seek(0)
+        return read_dataset_csv(buffer, columns), etag.strip('"')
+
+    path = cache_path(container_name, blob_name, etag)
+    if path.is_file():
+        registry.inc("blob_cache_hits_total", blob=blob_name)
+    else:
+        registry.inc("blob_cache_misses_total", blob=blob_name)
+        started = time.perf_counter()
+        _download_to_cache(
+            blob_client, path, etag, _cache_prefix(container_name, blob_name)
         )
+        _observe_download(blob_name, started)
+        logger.info("Cached %s (ETag %s) at %s", blob_name, etag, path)
 
-        # Download blob as bytes
-        blob_data = blob_client.download_blob().readall()
+    return read_dataset_csv(path, columns), etag.strip('"')
 
-        # Read into pandas DataFrame
-        df = pd.read_csv(io.BytesIO(blob_data))
 
-        return df
+def cached_blob_etag(blob_name: str, container_name: str = "datasets"):
+    """
+    ETag of the most recently cached version of a blob, without contacting
+    Blob Storage
 
-    except Exception as e:
-        raise
+    Returns:
+        str or None: The cached ETag, or None if nothing is cached
+    """
+    path = _latest_cached(container_name, blob_name)
+    if path is None:
+        return None
+    return path.name[len(_cache_prefix(container_name, blob_name)) :]
+
+
+def read_cached_csv(blob_name: str, container_name: str = "datasets", columns=None):
+    """
+    Read the most recently cached version of a blob from the disk cache
+    only, e.g. while Blob Storage is unreachable
+
+    Returns:
+        tuple or None: (pandas.DataFrame, ETag) or None if nothing is cached
+    """
+    path = _latest_cached(container_name, blob_name)
+    if path is None:
+        return None
+    etag = path.name[len(_cache_prefix(container_name, blob_name)) :]
+    return read_dataset_csv(path, columns), etag
+
+
+def _latest_cached(container_name: str, blob_name: str):
+    if not BLOB_CACHE_DIR:
+        return None
+    prefix = _cache_prefix(container_name, blob_name)
+    cached = Path(BLOB_CACHE_DIR).glob(f"{glob.escape(prefix)}*")
+    try:
+        return max(cached, key=lambda path: path.stat().st_mtime, default=None)
+    except FileNotFoundError:
+        # Replaced by a newer download while listing
+        return None
+
+
+def _observe_download(blob_name: str, started: float) -> None:
+    registry.observe(
+        "blob_download_duration_ms",
+        (time.perf_counter() - started) * 1000,
+        blob=blob_name,
+    )
+
+
+def get_blob_etag(blob_name: str, container_name: str = "datasets") -> str:
+    """
+    Get the current ETag of a blob without downloading it
+
+    Args:
+        blob_name: Name of the blob file (e.g., "All_Diets.csv")
+        container_name: Name of the container (default: "datasets")
+
+    Returns:
+        str: The blob's ETag (without surrounding quotes)
+    """
+    blob_service_client = get_blob_service_client()
+    blob_client = blob_service_client.get_blob_client(
+        container=container_name, blob=blob_name
+    )
+    return blob_client.get_blob_properties().etag.strip('"')
 
 
 def list_blobs(container_name: str = "datasets") -> list:
@@ -5,6 +5,7 @@ This module provides functions to list and clean up Azure cloud resources
 for the Nutritional Insights application using Azure SDK.
 """
 
+import logging
 import os
 from typing import Dict, Any, List
 from datetime import datetime
@@ -12,6 +13,8 @@ from azure.identity import DefaultAzureCredential
 from azure.mgmt.resource import ResourceManagementClient
 from .utils import get_secret_with_fallback
 
+logger = logging.getLogger(__name__)
+
 
 def list_resources_in_group() -> Dict[str, Any]:
     """
@@ -29,18 +32,18 @@ def list_resources_in_group() -> Dict[str, Any]:
             "AZURE_SUBSCRIPTION_ID", env_var_name="AZURE_SUBSCRIPTION_ID", default=None
         )
 
-        print(f"[CLEANUP] Resource Group: {resource_group}")
-        print(f"[CLEANUP] Subscription ID: {subscription_id}")
+        logger.info("Resource group: %s", resource_group)
+        logger.info("Subscription ID: %s", subscription_id)
 
         # If no subscription ID provided, raise error
         if not subscription_id:
-            print("[CLEANUP] No AZURE_SUBSCRIPTION_ID set in Key Vault or environment")
+            logger.error("No AZURE_SUBSCRIPTION_ID set in Key Vault or environment")
             raise ValueError(
                 "AZURE_SUBSCRIPTION_ID not found in Key Vault or environment variable. "
                 "Set it in Key Vault as AZURE-SUBSCRIPTION-ID or as AZURE_SUBSCRIPTION_ID env var."
             )
 
-        print(f"[CLEANUP] Listing resources in group: {resource_group}")
+        logger.info("Listing resources in group: %s", resource_group)
 
         # Use Managed Identity to authenticate
         credential = DefaultAzureCredential()
@@ -60,7 +63,7 @@ def list_resources_in_group() -> Dict[str, Any]:
                 }
             )
 
-        print(f"[CLEANUP] Found {len(resource_list)} resources")
+        logger.info("Found %d resources", len(resource_list))
 
         return {
             "status": "success",
@@ -72,7 +75,7 @@ def list_resources_in_group() -> Dict[str, Any]:
 
     except Exception as e:
         error_msg = str(e)
-        print(f"[CLEANUP] Error listing resources: {error_msg}")
+        logger.error("Error listing resources: %s", error_msg)
         return {
             "status": "error",
             "message": f"Failed to list resources: {error_msg}",
@@ -105,7 +108,7 @@ def delete_resources(resource_ids: List[str]) -> Dict[str, Any]:
                 "AZURE_SUBSCRIPTION_ID not found in Key Vault or environment variable"
             )
 
-        print(f"[CLEANUP] Starting deletion of {len(resource_ids)} resources")
+        logger.info("Starting deletion of %d resources", len(resource_ids))
 
         # Use Managed Identity to authenticate
         credential = DefaultAzureCredential()
@@ -116,7 +119,7 @@ def delete_resources(resource_ids: List[str]) -> Dict[str, Any]:
 
         for resource_id in resource_ids:
             try:
-                print(f"[CLEANUP] Deleting: {resource_id}")
+                logger.info("Deleting: %s", resource_id)
                 # Try with latest API versions first (2025, 2024), fall back to older versions
                 api_versions = [
                     "2025-05-01",
@@ -134,7 +137,7 @@ def delete_resources(resource_ids: List[str]) -> Dict[str, Any]:
                         poller = client.resources.begin_delete_by_id(
                             resource_id, api_version=api_version
                         )
-                        print(f"[CLEANUP] Using API version: {api_version}")
+                        logger.info("Using API version: %s", api_version)
                         break
                     except Exception as e:
                         if api_version == api_versions[-1]:
@@ -144,10 +147,10 @@ def delete_resources(resource_ids: List[str]) -> Dict[str, Any]:
                 if poller:
                     poller.wait()
                     deleted_resources.append(resource_id)
-                    print(f"[CLEANUP] Successfully deleted: {resource_id}")
+                    logger.info("Successfully deleted: %s", resource_id)
             except Exception as e:
                 error = str(e)
-                print(f"[CLEANUP] Failed to delete {resource_id}: {error}")
+                logger.error("Failed to delete %s: %s", resource_id, error)
                 failed_resources.append({"resource_id": resource_id, "error": error})
 
         return {
@@ -162,7 +165,7 @@ def delete_resources(resource_ids: List[str]) -> Dict[str, Any]:
 
     except Exception as e:
         error_msg = str(e)
-        print(f"[CLEANUP] Error during deletion: {error_msg}")
+        logger.error("Error during deletion: %s", error_msg)
         return {
             "status": "error",
             "message": f"Error during deletion: {error_msg}",
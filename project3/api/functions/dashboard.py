@@ -0,0 +1,56 @@
+"""
+Dashboard Module
+
+This module builds the composite payload the frontend needs on page load:
+nutritional insights, the first page of recipes and the recipe clusters for a
+diet type. All three are computed from a single dataset load so the page gets
+its data in one round trip and the dataset is only read once.
+
+Response Sections:
+- insights: Same payload as get_nutritional_insights()
+- recipes: Same payload as get_recipes()
+- clusters: Same payload as get_clusters()
+"""
+
+from .utils import load_dataset
+from .nutritional_insights import get_nutritional_insights
+from .get_recipes import get_recipes
+from .get_clusters import get_clusters
+
+
+def get_dashboard(
+    diet_type="all",
+    page=1,
+    page_size=20,
+    num_clusters=3,
+    df=None,
+    filename="All_Diets.csv",
+):
+    """
+    Get insights, a page of recipes and clusters for a diet type in one call.
+
+    Args:
+        diet_type: "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
+        page: Recipe page number (1-indexed)
+        page_size: Number of recipes per page (default 20)
+        num_clusters: Number of clusters to create (default 3)
+        df: Optional already-loaded dataset; loaded from blob or local when None
+        filename: Dataset to load when df is None (see resolve_dataset)
+
+    Returns:
+        Dictionary with "insights", "recipes" and "clusters" sections
+    """
+    try:
+        # Load dataset once and share it between all three sections
+        if df is None:
+            df = load_dataset(filename)
+
+        return {
+            "diet_type": diet_type,
+            "insights": get_nutritional_insights(diet_type, df=df),
+            "recipes": get_recipes(diet_type, page, page_size, df=df),
+            "clusters": get_clusters(diet_type, num_clusters, df=df),
+        }
+
+    except Exception as e:
+        return {"error": str(e), "diet_type": diet_type}
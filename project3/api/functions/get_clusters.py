@@ -22,15 +22,18 @@ from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import json
 from .utils import load_dataset, filter_by_diet_type
+from .utils.schema import CLUSTER_COLUMNS
 
 
-def get_clusters(diet_type="all", num_clusters=3):
+def get_clusters(diet_type="all", num_clusters=3, df=None, filename="All_Diets.csv"):
     """
     Get clusters of recipes based on nutritional similarity using K-means clustering.
 
     Args:
         diet_type: "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
         num_clusters: Number of clusters to create (default 3)
+        df: Optional already-loaded dataset; loaded from blob or local when None
+        filename: Dataset to load when df is None (see resolve_dataset)
 
     Returns:
         Dictionary with cluster summaries and metadata
@@ -44,8 +47,9 @@ def get_clusters(diet_type="all", num_clusters=3):
         except (ValueError, TypeError):
             num_clusters = 3
 
-        # Load dataset (from blob or local)
-        df = load_dataset("All_Diets.csv")
+        # Load dataset (from blob or local) unless the caller provided one
+        if df is None:
+            df = load_dataset(filename, columns=CLUSTER_COLUMNS)
 
         # Filter by diet type if specified
         df = filter_by_diet_type(df, diet_type)
@@ -70,8 +74,8 @@ def get_clusters(diet_type="all", num_clusters=3):
         kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
         clusters = kmeans.fit_predict(features_scaled)
 
-        # Add cluster labels to dataframe
-        df["cluster"] = clusters
+        # Add cluster labels to a new dataframe (the loaded one may be shared)
+        df = df.assign(cluster=clusters)
 
         # Generate cluster summaries
         cluster_summaries = []
@@ -20,9 +20,12 @@ Pagination:
 """
 
 from .utils import load_dataset, filter_by_diet_type
+from .utils.schema import format_day, format_time
 
 
-def get_recipes(diet_type="all", page=1, page_size=20):
+def get_recipes(
+    diet_type="all", page=1, page_size=20, df=None, filename="All_Diets.csv"
+):
     """
     Get recipes filtered by diet type with pagination.
 
@@ -30,6 +33,8 @@ def get_recipes(diet_type="all", page=1, page_size=20):
         diet_type: "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
         page: Page number (1-indexed)
         page_size: Number of recipes per page (default 20)
+        df: Optional already-loaded dataset; loaded from blob or local when None
+        filename: Dataset to load when df is None (see resolve_dataset)
 
     Returns:
         Dictionary with paginated recipe list and metadata
@@ -47,8 +52,9 @@ def get_recipes(diet_type="all", page=1, page_size=20):
             page = 1
             page_size = 20
 
-        # Load dataset (from blob or local)
-        df = load_dataset("All_Diets.csv")
+        # Load dataset (from blob or local) unless the caller provided one
+        if df is None:
+            df = load_dataset(filename)
 
         # Filter by diet type if specified
         df = filter_by_diet_type(df, diet_type)
@@ -90,8 +96,8 @@ def get_recipes(diet_type="all", page=1, page_size=20):
                 "protein_g": round(float(row["Protein(g)"]), 2),
                 "carbs_g": round(float(row["Carbs(g)"]), 2),
                 "fat_g": round(float(row["Fat(g)"]), 2),
-                "extraction_day": row["Extraction_day"],
-                "extraction_time": row["Extraction_time"],
+                "extraction_day": format_day(row["Extraction_day"]),
+                "extraction_time": format_time(row["Extraction_time"]),
             }
             recipes.append(recipe)
 
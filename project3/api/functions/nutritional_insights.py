@@ -26,21 +26,25 @@ import os
 import pandas as pd
 from pathlib import Path
 from .utils import load_dataset, filter_by_diet_type
+from .utils.schema import INSIGHTS_COLUMNS
 
 
-def get_nutritional_insights(diet_type="all"):
+def get_nutritional_insights(diet_type="all", df=None, filename="All_Diets.csv"):
     """
     Get nutritional insights for a specific diet type or all diets.
 
     Args:
         diet_type: "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
+        df: Optional already-loaded dataset; loaded from blob or local when None
+        filename: Dataset to load when df is None (see resolve_dataset)
 
     Returns:
         Dictionary with aggregated nutritional statistics
     """
     try:
-        # Load dataset (from blob or local)
-        df = load_dataset("All_Diets.csv")
+        # Load dataset (from blob or local) unless the caller provided one
+        if df is None:
+            df = load_dataset(filename, columns=INSIGHTS_COLUMNS)
 
         # Filter by diet type if specified
         df = filter_by_diet_type(df, diet_type)
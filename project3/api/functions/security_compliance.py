@@ -6,11 +6,14 @@ for the Nutritional Insights application. It integrates with Azure Key Vault for
 secure retrieval of security configuration.
 """
 
+import logging
 import os
 from datetime import datetime
 from typing import Dict, Any
 from .utils import get_keyvault_client, get_secret_with_fallback
 
+logger = logging.getLogger(__name__)
+
 
 def get_security_status() -> Dict[str, Any]:
     """
@@ -40,9 +43,9 @@ def get_security_status() -> Dict[str, Any]:
             # Try to list secrets to verify access
             list(client.list_properties_of_secrets())
             kv_accessible = True
-            print("[SECURITY] Key Vault is accessible")
+            logger.info("Key Vault is accessible")
         except Exception as e:
-            print(f"[SECURITY] Key Vault not accessible: {str(e)}")
+            logger.warning("Key Vault not accessible: %s", e)
 
         # Check required environment variables
         keyvault_url = os.getenv("AZURE_KEYVAULT_URL")
@@ -50,19 +53,17 @@ def get_security_status() -> Dict[str, Any]:
         # Try to get storage connection string from Key Vault first, then fallback to env var
         storage_connection = None
         try:
-            print(
-                "[SECURITY] Attempting to retrieve AZURE_STORAGE_CONNECTION_STRING from Key Vault (will be converted to AZURE-STORAGE-CONNECTION-STRING)"
+            logger.info(
+                "Attempting to retrieve AZURE_STORAGE_CONNECTION_STRING from Key Vault (will be converted to AZURE-STORAGE-CONNECTION-STRING)"
             )
             storage_connection = get_secret_with_fallback(
                 "AZURE_STORAGE_CONNECTION_STRING",
                 env_var_name="AZURE_STORAGE_CONNECTION_STRING",
                 default=None,
             )
-            print(
-                f"[SECURITY] Successfully retrieved storage connection from Key Vault"
-            )
+            logger.info("Successfully retrieved storage connection from Key Vault")
         except Exception as e:
-            print(f"[SECURITY] Could not retrieve storage connection: {str(e)}")
+            logger.warning("Could not retrieve storage connection: %s", e)
             storage_connection = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 
         # Validate that connection string is not a placeholder
@@ -99,7 +100,7 @@ def get_security_status() -> Dict[str, Any]:
         }
 
     except Exception as e:
-        print(f"[SECURITY] Error during security check: {str(e)}")
+        logger.error("Error during security check: %s", e)
         return {
             "encryption": "Unknown",
             "access_control": "Unknown",
@@ -1,9 +1,26 @@
-from .dataset_utils import load_dataset, filter_by_diet_type
+from .dataset_utils import (
+    load_dataset,
+    filter_by_diet_type,
+    get_dataset_version,
+    resolve_dataset,
+)
+from .dataset_registry import UnknownDatasetError
+from .singleflight import SingleFlight
+from .timing import stage
+from .middleware import http_handler
+from .metrics import registry as metrics_registry
 from .keyvault_utils import get_keyvault_client, get_secret_with_fallback
 
 __all__ = [
     "load_dataset",
     "filter_by_diet_type",
+    "get_dataset_version",
+    "resolve_dataset",
+    "UnknownDatasetError",
+    "SingleFlight",
+    "stage",
+    "http_handler",
+    "metrics_registry",
     "get_keyvault_client",
     "get_secret_with_fallback",
 ]
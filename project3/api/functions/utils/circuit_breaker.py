@@ -0,0 +1,110 @@
+"""
+Circuit breaker for calls to a dependency that can become unreachable
+
+closed     calls go through; failure_threshold consecutive failures open it
+open       calls are refused until the back-off delay has passed; each time
+           the breaker re-opens the delay doubles, up to max_delay
+half-open  one probe call is let through; success closes the breaker and
+           resets the back-off, failure re-opens it
+
+The state is published as metrics (circuit_breaker_state, with 0 = closed,
+1 = half-open, 2 = open) so it shows up on /api/metrics.
+"""
+
+import random
+import threading
+import time
+
+from .metrics import registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with exponential back-off and a single
+    half-open probe
+    """
+
+    def __init__(self, name, failure_threshold=1, base_delay=5.0, max_delay=300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opens = 0
+        self._retry_at = 0.0
+        self._probing = False
+        self._publish()
+
+    def allow(self):
+        """
+        Whether a call may be attempted now
+
+        When the back-off has elapsed, the first caller becomes the half-open
+        probe and every other caller is refused until it reports back.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() >= self._retry_at:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opens = 0
+            self._probing = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            # A call that started before the breaker opened must not extend the back-off
+            if self._state == OPEN:
+                return
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                # Capped so a days-long outage cannot overflow the float delay
+                self._opens = min(self._opens + 1, 32)
+                delay = min(self.base_delay * 2 ** (self._opens - 1), self.max_delay)
+                # Jitter keeps workers that failed together from probing together
+                self._retry_at = time.monotonic() + delay * random.uniform(0.8, 1.0)
+                self._transition(OPEN)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: state, consecutive failures and seconds until the next probe
+        """
+        with self._lock:
+            retry_in = max(0.0, self._retry_at - time.monotonic())
+            return {
+                "state": self._state,
+                "failures": self._failures,
+                "retry_in_seconds": round(retry_in, 1) if self._state == OPEN else 0.0,
+            }
+
+    def _transition(self, state):
+        if state != self._state:
+            registry.inc(
+                "circuit_breaker_transitions_total", breaker=self.name, to=state
+            )
+        self._state = state
+        self._publish()
+
+    def _publish(self):
+        registry.set_gauge(
+            "circuit_breaker_state", _STATE_VALUES[self._state], breaker=self.name
+        )
@@ -0,0 +1,158 @@
+"""
+Registry of the datasets the API can serve and of those held in memory.
+
+Endpoints pick a dataset with the `dataset` query parameter (e.g.
+?dataset=All_Diets_EU). DatasetRegistry.resolve() turns that name into a CSV
+filename. Only names made of letters, digits, "_" and "-" are accepted, and
+only names in the catalogue: the DATASETS setting (comma-separated, for
+blob-only variants) or else the CSV files in DATASETS_DIR. So a request
+can never reach a path or blob that is not a known dataset.
+
+Datasets are loaded on demand. The registry records the memory each resident
+dataset holds. When the total exceeds the budget it evicts the least
+recently used datasets. The one just loaded is always kept, even when it
+alone is over the budget.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET = "All_Diets"
+
+_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+
+class UnknownDatasetError(LookupError):
+    """
+    A well-formed dataset name that is not in the catalogue
+    """
+
+
+class DatasetRegistry:
+    """
+    Catalogue of servable datasets plus LRU memory accounting
+
+    Args:
+        directory: Folder of local dataset CSVs
+        names: Optional explicit catalogue; the folder's CSVs when None
+        memory_budget: Bytes allowed for resident datasets; 0 for no limit
+        evict: Callable(filename) that drops a dataset from memory
+    """
+
+    def __init__(self, directory, names=None, memory_budget=0, evict=None):
+        self.directory = Path(directory)
+        self.memory_budget = memory_budget
+        self._fixed = names is not None
+        self._names = {}
+        self._evict = evict
+        self._resident = OrderedDict()
+        self._lock = threading.Lock()
+        self._catalogue(names)
+        registry.set_gauge("dataset_memory_budget_bytes", memory_budget)
+
+    def names(self):
+        """
+        Returns:
+            list: Sorted names of the servable datasets
+        """
+        return sorted(self._names.values())
+
+    def resolve(self, name=None):
+        """
+        Map a dataset name to its CSV filename
+
+        Names are matched case-insensitively and may end in ".csv". An empty
+        name selects DEFAULT_DATASET.
+
+        Raises:
+            ValueError: If the name is malformed
+            UnknownDatasetError: If no such dataset exists
+        """
+        name = str(name or DEFAULT_DATASET).strip()
+        if name.lower().endswith(".csv"):
+            name = name[:-4]
+        if not _NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"Invalid dataset name '{name}'")
+
+        key = name.lower()
+        # Pick up CSVs added to the folder since the last scan
+        if key not in self._names and not self._fixed:
+            self._catalogue(None)
+        if key not in self._names:
+            raise UnknownDatasetError(f"Unknown dataset '{name}'")
+        return f"{self._names[key]}.csv"
+
+    def admit(self, filename, nbytes):
+        """
+        Record a dataset held in memory and evict others over the budget
+
+        A dataset that is already resident keeps its place in the LRU order,
+        so background reloads do not count as use.
+        """
+        with self._lock:
+            self._resident[filename] = nbytes
+            evicted = []
+            while (
+                self.memory_budget
+                and sum(self._resident.values()) > self.memory_budget
+                and len(self._resident) > 1
+            ):
+                victim = next(name for name in self._resident if name != filename)
+                evicted.append((victim, self._resident.pop(victim)))
+            if self.memory_budget and nbytes > self.memory_budget:
+                logger.warning(
+                    "Dataset %s (%.1f MB) alone exceeds the %.1f MB budget",
+                    filename,
+                    nbytes / 1e6,
+                    self.memory_budget / 1e6,
+                )
+            self._publish()
+
+        for victim, size in evicted:
+            logger.info("Evicting dataset %s (%.1f MB)", victim, size / 1e6)
+            registry.inc("dataset_evictions_total", filename=victim)
+            if self._evict is not None:
+                self._evict(victim)
+
+    def touch(self, filename):
+        """
+        Mark a resident dataset as most recently used
+        """
+        with self._lock:
+            if filename in self._resident:
+                self._resident.move_to_end(filename)
+
+    def resident(self):
+        """
+        Returns:
+            dict: filename -> bytes, least recently used first
+        """
+        with self._lock:
+            return dict(self._resident)
+
+    def _catalogue(self, names):
+        if names is None:
+            names = [path.stem for path in self.directory.glob("*.csv")]
+        catalogue = {}
+        for name in names:
+            name = name.strip()
+            if name.lower().endswith(".csv"):
+                name = name[:-4]
+            if not name:
+                continue
+            if not _NAME_PATTERN.fullmatch(name):
+                logger.warning("Ignoring dataset with invalid name '%s'", name)
+                continue
+            catalogue[name.lower()] = name
+        self._names = catalogue
+
+    def _publish(self):
+        registry.set_gauge("dataset_resident_count", len(self._resident))
+        registry.set_gauge("dataset_resident_bytes", sum(self._resident.values()))
@@ -3,34 +3,315 @@ Utility functions for data loading and processing.
 Centralizes common functionality used across multiple functions.
 """
 
+import logging
 import os
-import pandas as pd
+import time
 from pathlib import Path
 
+from .circuit_breaker import CircuitBreaker
+from .dataset_registry import DatasetRegistry
+from .metrics import registry
+from .schema import memory_bytes, read_dataset_csv
+from .singleflight import SingleFlight
+from .snapshots import SnapshotStore
+from .timing import stage
 
-def load_dataset(filename="All_Diets.csv"):
+logger = logging.getLogger(__name__)
+
+# Coalesces concurrent loads of the same dataset into a single read
+dataset_flight = SingleFlight()
+
+# Stops every request from paying the connection timeout while Blob Storage
+# is unreachable; see circuit_breaker.py
+blob_breaker = CircuitBreaker(
+    "blob_storage",
+    base_delay=float(os.getenv("BLOB_BREAKER_BASE_DELAY", "5")),
+    max_delay=float(os.getenv("BLOB_BREAKER_MAX_DELAY", "300")),
+)
+
+# Last dataset successfully read from Blob Storage: filename -> (DataFrame, ETag)
+_last_good_blob = {}
+
+# Folder of the local dataset CSVs (the fallback when Blob Storage is not used)
+DATASETS_DIR = Path(
+    os.getenv("DATASETS_DIR") or Path(__file__).parent.parent / "datasets"
+)
+
+
+def load_dataset(filename="All_Diets.csv", columns=None):
     """
     Load dataset from Azure Blob Storage or local filesystem.
     Falls back to local if blob storage is not configured.
 
+    While blob_breaker is open (Blob Storage recently failed), the blob is
+    not contacted: the last snapshot read from it (in memory, else in the
+    blob disk cache) is served, or the local file if there is none.
+
+    With DATASET_REFRESH_INTERVAL > 0 (the default) the DataFrame comes from
+    the dataset's current snapshot, which a background thread keeps up to
+    date (see snapshots.py), so only the first call (or the first after the
+    dataset was evicted) reads the source.
+    Otherwise every call reads it, with concurrent calls for the same
+    filename sharing one download/parse. Either way callers receive a shared
+    DataFrame and must not modify it in place.
+
+    Columns are parsed with the lean dtypes from schema.py (categoricals,
+    float32 macros, datetime extraction columns).
+
+    Resident datasets count against DATASET_MEMORY_BUDGET_MB; when it is
+    exceeded the least recently used ones are evicted (see dataset_registry.py).
+
     Args:
         filename: Name of the CSV file to load (default: "All_Diets.csv")
+        columns: Columns the caller reads (e.g. schema.INSIGHTS_COLUMNS). When
+                 reading per request only these are parsed; a shared snapshot
+                 is returned whole, and may have more columns
 
     Returns:
         pandas.DataFrame: The loaded dataset
     """
+    with stage("load"):
+        dataset_registry.touch(filename)
+        if dataset_snapshots is not None:
+            return dataset_snapshots.get(filename).df
+        if columns is not None:
+            columns = tuple(columns)
+        return dataset_flight.do(
+            (filename, columns), lambda: _read_dataset(filename, columns)
+        )
+
+
+def _project(df, columns):
+    if columns is None:
+        return df
+    return df[[column for column in df.columns if column in set(columns)]]
+
+
+def _read_dataset(filename, columns=None):
+    started = time.perf_counter()
+    source = "blob"
+    df = None
+
     # Try to load from Azure Blob Storage first
     if os.getenv("AZURE_STORAGE_CONNECTION_STRING"):
+        if blob_breaker.allow():
+            try:
+                from ..blob_storage import read_csv_from_blob_with_etag
+
+                df, etag = read_csv_from_blob_with_etag(filename, columns=columns)
+                # Only full frames can stand in for later loads
+                if columns is None:
+                    _last_good_blob[filename] = (df, etag)
+                blob_breaker.record_success()
+            except Exception as e:
+                _record_blob_error(e)
+                logger.warning(
+                    "Blob load of %s failed, falling back to last good snapshot: %s",
+                    filename,
+                    e,
+                )
+                registry.inc("dataset_blob_fallbacks_total", filename=filename)
+        else:
+            registry.inc("dataset_blob_short_circuits_total", filename=filename)
+
+        if df is None:
+            snapshot = _last_good_snapshot(filename)
+            if snapshot is not None:
+                source = "snapshot"
+                df = _project(snapshot[0], columns)
+
+    # Fallback to local filesystem
+    if df is None:
+        source = "local"
+        csv_path = DATASETS_DIR / filename
+        df = read_dataset_csv(csv_path, columns)
+
+    registry.observe(
+        "dataset_load_duration_ms",
+        (time.perf_counter() - started) * 1000,
+        filename=filename,
+        source=source,
+    )
+    registry.set_gauge("dataset_rows", len(df), filename=filename)
+    if columns is None:
+        memory = memory_bytes(df)
+        registry.set_gauge("dataset_memory_bytes", memory["total"], filename=filename)
+        logger.info(
+            "Loaded %s from %s: %d rows, %.1f MB",
+            filename,
+            source,
+            len(df),
+            memory["total"] / 1e6,
+            extra={"memory_bytes": memory},
+        )
+        # A frame kept as the last good blob counts against the memory budget
+        if _last_good_blob.get(filename, (None,))[0] is df:
+            dataset_registry.admit(filename, memory["total"])
+    return df
+
+
+def _record_blob_error(error):
+    """
+    Report a failed blob call to blob_breaker
+
+    A missing blob (e.g. a DATASETS variant not uploaded) means Blob Storage
+    answered, so it counts as a success instead of opening the breaker for
+    every other dataset.
+    """
+    try:
+        from azure.core.exceptions import ResourceNotFoundError
+    except ImportError:  # pragma: no cover - optional dependency
+        ResourceNotFoundError = ()
+
+    if isinstance(error, ResourceNotFoundError):
+        blob_breaker.record_success()
+    else:
+        blob_breaker.record_failure()
+
+
+def _last_good_snapshot(filename):
+    """
+    (DataFrame, ETag) last read from Blob Storage, from memory or the blob
+    disk cache, or None
+    """
+    snapshot = _last_good_blob.get(filename)
+    if snapshot is None:
         try:
-            from ..blob_storage import read_csv_from_blob
+            from ..blob_storage import read_cached_csv
 
-            return read_csv_from_blob(filename)
+            snapshot = read_cached_csv(filename)
         except Exception as e:
-            pass
+            logger.warning("Reading cached blob %s failed: %s", filename, e)
+        if snapshot is not None:
+            _last_good_blob[filename] = snapshot
+            dataset_registry.admit(filename, memory_bytes(snapshot[0])["total"])
+    return snapshot
 
-    # Fallback to local filesystem
-    csv_path = Path(__file__).parent.parent / "datasets" / filename
-    return pd.read_csv(csv_path)
+
+def _last_good_etag(filename):
+    if filename in _last_good_blob:
+        return _last_good_blob[filename][1]
+    try:
+        from ..blob_storage import cached_blob_etag
+
+        return cached_blob_etag(filename)
+    except Exception:
+        return None
+
+
+def get_dataset_version(filename="All_Diets.csv"):
+    """
+    Get a version identifier for the dataset load_dataset returns.
+
+    With snapshots enabled this is the version of the current request's
+    snapshot; otherwise the source is probed as in _probe_version().
+
+    Args:
+        filename: Name of the CSV file (default: "All_Diets.csv")
+
+    Returns:
+        str: Opaque version string that changes whenever the dataset changes
+    """
+    if dataset_snapshots is not None:
+        dataset_registry.touch(filename)
+        return dataset_snapshots.get(filename).version
+    return _probe_version(filename)
+
+
+def _probe_version(filename):
+    """
+    Get a version identifier for a dataset's source without loading it.
+
+    Uses the blob ETag when blob storage is configured and reachable (the same
+    source load_dataset would read), otherwise the ETag of the last good blob
+    snapshot, otherwise the local file's mtime and size.
+
+    Args:
+        filename: Name of the CSV file (default: "All_Diets.csv")
+
+    Returns:
+        str: Opaque version string that changes whenever the dataset changes
+    """
+    version = None
+    if os.getenv("AZURE_STORAGE_CONNECTION_STRING"):
+        if blob_breaker.allow():
+            try:
+                from ..blob_storage import get_blob_etag
+
+                version = f"blob-{get_blob_etag(filename)}"
+                blob_breaker.record_success()
+            except Exception as e:
+                _record_blob_error(e)
+
+        if version is None:
+            etag = _last_good_etag(filename)
+            if etag is not None:
+                version = f"blob-{etag}"
+
+    if version is None:
+        stat = (DATASETS_DIR / filename).stat()
+        version = f"local-{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    registry.set_info(
+        "dataset_version_info", filename, filename=filename, version=version
+    )
+    return version
+
+
+def resolve_dataset(name=None):
+    """
+    Map a request's dataset name to its CSV filename (see dataset_registry.py).
+
+    Args:
+        name: Dataset name, e.g. "All_Diets"; None or "" for the default
+
+    Returns:
+        str: Filename to pass to load_dataset()
+
+    Raises:
+        ValueError: If the name is malformed
+        UnknownDatasetError: If no such dataset exists
+    """
+    return dataset_registry.resolve(name)
+
+
+def _evict_dataset(filename):
+    if dataset_snapshots is not None:
+        dataset_snapshots.evict(filename)
+    _last_good_blob.pop(filename, None)
+
+
+# Datasets that may be requested (comma-separated); defaults to the CSVs in
+# DATASETS_DIR. Set it to serve variants that exist only in Blob Storage
+DATASETS = os.getenv("DATASETS", "")
+
+# Memory in MB the resident datasets may hold before the least recently used
+# ones are evicted; 0 disables the limit
+DATASET_MEMORY_BUDGET_MB = float(os.getenv("DATASET_MEMORY_BUDGET_MB", "512"))
+
+dataset_registry = DatasetRegistry(
+    DATASETS_DIR,
+    names=DATASETS.split(",") if DATASETS.strip() else None,
+    memory_budget=int(DATASET_MEMORY_BUDGET_MB * 1e6),
+    evict=_evict_dataset,
+)
+
+# Seconds between background checks for a new dataset version; 0 disables
+# snapshots so every request reads the dataset
+DATASET_REFRESH_INTERVAL = float(os.getenv("DATASET_REFRESH_INTERVAL", "30"))
+
+dataset_snapshots = (
+    SnapshotStore(
+        _read_dataset,
+        _probe_version,
+        DATASET_REFRESH_INTERVAL,
+        on_swap=lambda snapshot: dataset_registry.admit(
+            snapshot.filename, snapshot.memory_bytes
+        ),
+    )
+    if DATASET_REFRESH_INTERVAL > 0
+    else None
+)
 
 
 def filter_by_diet_type(df, diet_type="all"):
@@ -47,5 +328,10 @@ def filter_by_diet_type(df, diet_type="all"):
     if diet_type.lower() == "all":
         return df
 
-    filtered_df = df[df["Diet_type"].str.lower() == diet_type.lower()]
+    with stage("filter"):
+        # A snapshot's frame has a prebuilt per-diet index
+        snapshot = dataset_snapshots.for_frame(df) if dataset_snapshots else None
+        if snapshot is not None:
+            return snapshot.rows_for_diet(diet_type)
+        filtered_df = df[df["Diet_type"].str.lower() == diet_type.lower()]
     return filtered_df
@@ -0,0 +1,121 @@
+"""
+HTTP caching validators for data endpoints.
+
+Derives a strong ETag from the dataset version plus the route and its
+normalized query parameters, so a conditional request can be answered with
+304 Not Modified before the dataset is loaded or anything is computed.
+"""
+
+import hashlib
+import os
+
+import azure.functions as func
+
+from .dataset_utils import get_dataset_version
+
+# Default Cache-Control for data endpoints; override per route with
+# CACHE_CONTROL_<ROUTE> (e.g. CACHE_CONTROL_CLUSTERS, CACHE_CONTROL_NUTRITIONAL_INSIGHTS)
+DEFAULT_CACHE_CONTROL = os.getenv(
+    "DATA_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300"
+)
+
+# Query parameters that never change the response body
+IGNORED_PARAMS = {"code"}
+
+
+def get_cache_control(route: str) -> str:
+    env_name = "CACHE_CONTROL_" + route.upper().replace("-", "_").replace("/", "_")
+    return os.getenv(env_name, DEFAULT_CACHE_CONTROL)
+
+
+def compute_etag(route: str, params, version: str) -> str:
+    """
+    Build a strong ETag for a route, its parameters and a dataset version.
+
+    Args:
+        route: Function route (e.g. "recipes")
+        params: Mapping of query parameters
+        version: Dataset version from get_dataset_version()
+
+    Returns:
+        str: Quoted ETag value
+    """
+    normalized = "&".join(
+        f"{key}={str(value).strip()}"
+        for key, value in sorted(params.items())
+        if key not in IGNORED_PARAMS
+    )
+    digest = hashlib.sha256(f"{route}|{version}|{normalized}".encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def data_cache_headers(
+    req: func.HttpRequest, route: str, filename: str = "All_Diets.csv"
+) -> dict:
+    """
+    Compute the ETag and Cache-Control headers for a data request.
+
+    Args:
+        req: Incoming request
+        route: Function route (e.g. "recipes")
+        filename: Dataset the route reads (default: "All_Diets.csv")
+
+    Returns:
+        dict: Response headers with ETag and Cache-Control
+    """
+    version = get_dataset_version(filename)
+    return {
+        "ETag": compute_etag(route, dict(req.params), version),
+        "Cache-Control": get_cache_control(route),
+    }
+
+
+def is_not_modified(req: func.HttpRequest, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Uses weak comparison as required for If-None-Match, so W/-prefixed
+    validators from intermediaries and any encoded variant still match.
+    """
+    return matching_etag(req, etag) is not None
+
+
+def matching_etag(req: func.HttpRequest, etag: str):
+    """
+    Find the validator in If-None-Match that matches an ETag.
+
+    Returns:
+        str or None: The matched ETag as the client holds it, including the
+                     encoding suffix of a compressed representation (e.g.
+                     '"abc-gzip"'); etag itself for "*"; None when nothing matches
+    """
+    if_none_match = req.headers.get("If-None-Match")
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        # Compressed representations carry an encoding suffix (see json_response)
+        base = tag
+        for suffix in ('-gzip"', '-br"'):
+            if tag.endswith(suffix):
+                base = tag[: -len(suffix)] + '"'
+        if base == etag:
+            return tag
+    return None
+
+
+def not_modified_response(
+    headers: dict, req: func.HttpRequest = None
+) -> func.HttpResponse:
+    """
+    Build a 304 response for a conditional request.
+
+    With req, the ETag header is the one of the representation the client
+    validated (e.g. the -gzip variant), not the unencoded one.
+    """
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if req is not None and "ETag" in headers:
+        headers["ETag"] = matching_etag(req, headers["ETag"]) or headers["ETag"]
+    return func.HttpResponse(status_code=304, headers=headers)
@@ -2,10 +2,13 @@
 Azure Key Vault utility for retrieving secrets securely
 """
 
+import logging
 import os
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
 
+logger = logging.getLogger(__name__)
+
 
 def get_keyvault_client():
     """
@@ -81,22 +84,20 @@ def get_secret_with_fallback(
         return get_secret(secret_name)
     except Exception as e:
         keyvault_secret_name = secret_name.replace("_", "-")
-        print(
-            f"[KEY VAULT] Warning: Could not retrieve '{keyvault_secret_name}' from Key Vault: {str(e)}"
+        logger.warning(
+            "Could not retrieve '%s' from Key Vault: %s", keyvault_secret_name, e
         )
 
         # Fallback to environment variable
         if env_var_name:
             env_value = os.getenv(env_var_name)
             if env_value:
-                print(
-                    f"[KEY VAULT] Using fallback environment variable: {env_var_name}"
-                )
+                logger.info("Using fallback environment variable: %s", env_var_name)
                 return env_value
 
         # Fallback to default
         if default is not None:
-            print(f"[KEY VAULT] Using default value for '{secret_name}'")
+            logger.info("Using default value for '%s'", secret_name)
             return default
 
         # No fallback available
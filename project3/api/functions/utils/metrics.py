@@ -0,0 +1,195 @@
+"""
+In-process metrics for the Function App.
+
+Keeps thread-safe histograms, counters and gauges keyed by metric name and
+labels so handlers can record where time goes without an external metrics
+backend, and renders them in the Prometheus text exposition format.
+"""
+
+import threading
+
+# Upper bounds in milliseconds; the implicit last bucket is +Inf
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram of observed values
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Cumulative bucket counts keyed by upper bound ("+Inf" last), sum and count
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += bucket_count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+
+class Gauge:
+    """
+    Single value that can be set, or incremented for counters
+    """
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        with self._lock:
+            return self._value
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value):
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Registry of named metrics, one instance per unique label set
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._values = {}
+        self._types = {}
+        self._info = {}
+        self._lock = threading.Lock()
+
+    def _get(self, store, kind, name, labels, factory):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = store.get(key)
+            if metric is None:
+                metric = store[key] = factory()
+                self._types.setdefault(name, kind)
+        return metric
+
+    def histogram(self, name, buckets=DEFAULT_BUCKETS_MS, **labels):
+        return self._get(
+            self._histograms, "histogram", name, labels, lambda: Histogram(buckets)
+        )
+
+    def observe(self, name, value, **labels):
+        self.histogram(name, **labels).observe(value)
+
+    def counter(self, name, **labels):
+        return self._get(self._values, "counter", name, labels, Gauge)
+
+    def inc(self, name, amount=1, **labels):
+        self.counter(name, **labels).inc(amount)
+
+    def gauge(self, name, **labels):
+        return self._get(self._values, "gauge", name, labels, Gauge)
+
+    def set_gauge(self, name, value, **labels):
+        self.gauge(name, **labels).set(value)
+
+    def set_info(self, name, key, **labels):
+        """
+        Publish a constant-1 series whose labels carry the information (e.g. a
+        version string); a later call with the same key replaces the labels
+        """
+        with self._lock:
+            self._info.setdefault(name, {})[key] = tuple(sorted(labels.items()))
+            self._types.setdefault(name, "gauge")
+
+    def histograms(self):
+        """
+        Returns:
+            list: (name, labels dict, snapshot) for every registered histogram
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+        return [
+            (name, dict(labels), histogram.snapshot())
+            for (name, labels), histogram in items
+        ]
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text, one "# TYPE" block per metric name
+        """
+        with self._lock:
+            types = dict(self._types)
+            values = list(self._values.items())
+            info = {name: list(series.values()) for name, series in self._info.items()}
+
+        samples = {name: [] for name in types}
+        for (name, labels), metric in values:
+            samples[name].append(
+                f"{name}{_format_labels(labels)} {_format_value(metric.value)}"
+            )
+        for name, series in info.items():
+            for labels in series:
+                samples[name].append(f"{name}{_format_labels(labels)} 1")
+        for name, labels, snapshot in self.histograms():
+            labels = sorted(labels.items())
+            for bound, count in snapshot["buckets"].items():
+                bucket_labels = labels + [("le", bound)]
+                samples[name].append(
+                    f"{name}_bucket{_format_labels(bucket_labels)} {count}"
+                )
+            samples[name].append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}"
+            )
+            samples[name].append(
+                f"{name}_count{_format_labels(labels)} {snapshot['count']}"
+            )
+
+        lines = []
+        for name in sorted(samples):
+            lines.append(f"# TYPE {name} {types[name]}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,101 @@
+"""
+Shared HTTP handler middleware with per-stage timing.
+
+Wrap a Function handler with @http_handler("route") to get the common error
+envelope plus timing of the load, filter, compute and serialize stages. The
+timings are returned as a Server-Timing header, logged as structured fields
+and recorded in the in-process latency histograms. Opted-in requests are also
+profiled (see profiling.py), and every request reads one pinned dataset
+snapshot (see snapshots.py).
+"""
+
+import logging
+import time
+from datetime import datetime
+from functools import wraps
+
+import azure.functions as func
+
+from .metrics import registry
+from .profiling import finish_profile, start_profile
+from .response_utils import json_response
+from .snapshots import snapshot_scope
+from .timing import RequestTimer, current_timer, format_server_timing, stage
+
+logger = logging.getLogger("nutritional_insights.requests")
+
+
+def http_handler(route, error_envelope="error"):
+    """
+    Decorator applying the shared error handling and stage timing to a handler.
+
+    Args:
+        route: Route name used in logs, metrics and histograms
+        error_envelope: "error" for {"error": message} bodies, or "status" for
+                        {"status": "error", "message", "timestamp"} bodies
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(req: func.HttpRequest, *args, **kwargs) -> func.HttpResponse:
+            timer = RequestTimer()
+            token = current_timer.set(timer)
+            started = time.perf_counter()
+            profile = start_profile(req, route)
+            try:
+                with snapshot_scope(), stage("compute"):
+                    response = handler(req, *args, **kwargs)
+            except Exception as e:
+                logger.exception("Unhandled error in %s handler", route)
+                if error_envelope == "status":
+                    body = {
+                        "status": "error",
+                        "message": str(e),
+                        "timestamp": datetime.utcnow().isoformat(),
+                    }
+                else:
+                    body = {"error": str(e)}
+                response = json_response(body, status_code=500, req=req)
+            finally:
+                current_timer.reset(token)
+
+            if profile is not None:
+                # A profile that cannot be stored must not fail the response
+                try:
+                    response.headers["X-Profile-Id"] = finish_profile(profile)
+                except Exception:
+                    logger.exception("Storing the profile of %s failed", route)
+
+            total_ms = (time.perf_counter() - started) * 1000
+            response.headers["Server-Timing"] = format_server_timing(
+                timer.stages, total_ms
+            )
+
+            registry.observe("request_duration_ms", total_ms, route=route)
+            for name, duration in timer.stages.items():
+                registry.observe(
+                    "request_stage_duration_ms", duration, route=route, stage=name
+                )
+
+            logger.info(
+                "%s %s -> %s in %.2fms",
+                req.method,
+                route,
+                response.status_code,
+                total_ms,
+                extra={
+                    "route": route,
+                    "method": req.method,
+                    "status_code": response.status_code,
+                    "duration_ms": round(total_ms, 2),
+                    "stages_ms": {
+                        name: round(duration, 2)
+                        for name, duration in timer.stages.items()
+                    },
+                },
+            )
+            return response
+
+        return wrapper
+
+    return decorator
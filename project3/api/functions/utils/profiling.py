@@ -0,0 +1,221 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when it carries the admin token from PROFILE_ADMIN_TOKEN
+in its X-Profile-Token header, or when it is picked by PROFILE_SAMPLE_RATE
+(a fraction between 0 and 1, default 0). A profiled request records cProfile
+stats and the top tracemalloc allocations. The report is stored as JSON under
+PROFILE_DIR and its id is returned in the X-Profile-Id response header, so it
+can be fetched from /api/profiles/{id} with the same admin token.
+
+The two halves of a report cover different things. cProfile only sees the
+thread running the handler. tracemalloc is process-wide: the memory figures
+and top allocations include whatever other requests allocated while the
+sample ran, and tracing slows every thread for that time. Reports say so in
+their "scope" fields; read allocations from a quiet worker, or with
+PROFILE_SAMPLE_RATE low enough that samples rarely overlap other traffic.
+
+When neither trigger is configured, the per-request cost is a single check of
+the two settings.
+"""
+
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = Path(
+    os.getenv(
+        "PROFILE_DIR",
+        os.path.join(tempfile.gettempdir(), "nutritional-insights-profiles"),
+    )
+)
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+PROFILE_TOP_FUNCTIONS = 30
+PROFILE_TOP_ALLOCATIONS = 20
+TRACEMALLOC_FRAMES = 5
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# cProfile and tracemalloc are process-wide, so only one request is profiled
+# at a time; others arriving meanwhile simply run unprofiled
+_profile_lock = threading.Lock()
+
+
+def is_admin(req) -> bool:
+    token = req.headers.get("X-Profile-Token")
+    return bool(
+        PROFILE_ADMIN_TOKEN
+        and token
+        and hmac.compare_digest(
+            token.encode("utf-8"), PROFILE_ADMIN_TOKEN.encode("utf-8")
+        )
+    )
+
+
+def should_profile(req) -> bool:
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return True
+    return is_admin(req)
+
+
+class RequestProfile:
+    """
+    cProfile capture of a request's handler thread, plus tracemalloc
+    capture of the whole process while the request runs
+    """
+
+    def __init__(self, route):
+        self.route = route
+        self.profile_id = uuid.uuid4().hex
+        self._profiler = cProfile.Profile()
+        self._started_tracemalloc = False
+        self._started = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self):
+        """
+        Stop capturing and build the report
+
+        Returns:
+            dict: Report with the top functions by cumulative time on the
+                  handler thread and the largest allocations made in the
+                  process (by any thread) while the request ran
+        """
+        self._profiler.disable()
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        return {
+            "id": self.profile_id,
+            "route": self.route,
+            "timestamp": datetime.utcnow().isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "functions_scope": "handler thread",
+            "functions": self._top_functions(),
+            "memory": {
+                "scope": "process",
+                "note": (
+                    "tracemalloc is process-wide: includes allocations by "
+                    "other requests running at the same time"
+                ),
+                "current_kb": round(current / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top_allocations": self._top_allocations(snapshot),
+            },
+        }
+
+    def _top_functions(self):
+        stats = pstats.Stats(self._profiler)
+        rows = []
+        for (filename, line, name), row in stats.stats.items():
+            _, ncalls, tottime, cumtime, _ = row
+            rows.append(
+                {
+                    "function": name,
+                    "location": f"{filename}:{line}",
+                    "calls": ncalls,
+                    "own_ms": round(tottime * 1000, 3),
+                    "cumulative_ms": round(cumtime * 1000, 3),
+                }
+            )
+        rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+        return rows[:PROFILE_TOP_FUNCTIONS]
+
+    def _top_allocations(self, snapshot):
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        return [
+            {
+                "location": str(stat.traceback[0]),
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]
+        ]
+
+
+def start_profile(req, route):
+    """
+    Begin profiling a request if it is opted in and no other profile is running
+
+    Returns:
+        RequestProfile or None: Active profile, to be passed to finish_profile()
+    """
+    if not (PROFILE_SAMPLE_RATE > 0 or PROFILE_ADMIN_TOKEN):
+        return None
+    if not should_profile(req) or not _profile_lock.acquire(blocking=False):
+        return None
+    profile = RequestProfile(route)
+    try:
+        profile.start()
+    except Exception:
+        _profile_lock.release()
+        raise
+    return profile
+
+
+def finish_profile(profile):
+    """
+    Stop a profile started by start_profile() and store its report
+
+    Returns:
+        str: Profile id for the X-Profile-Id header
+    """
+    try:
+        report = profile.stop()
+    finally:
+        _profile_lock.release()
+    save_profile(report)
+    return report["id"]
+
+
+def save_profile(report):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    (PROFILE_DIR / f"{report['id']}.json").write_text(json.dumps(report, indent=2))
+
+    # Keep only the most recent reports
+    stored = sorted(PROFILE_DIR.glob("*.json"), key=lambda path: path.stat().st_mtime)
+    for path in stored[:-PROFILE_MAX_STORED]:
+        path.unlink(missing_ok=True)
+
+
+def load_profile(profile_id):
+    """
+    Load a stored profile report
+
+    Returns:
+        dict or None: The report, or None for an unknown or malformed id
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id or ""):
+        return None
+    path = PROFILE_DIR / f"{profile_id}.json"
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text())
@@ -0,0 +1,150 @@
+"""
+Shared JSON response helpers for HTTP handlers.
+
+Serializes with orjson when it is installed (stdlib json otherwise) and
+compresses bodies above a size threshold with brotli or gzip, negotiated from
+the request's Accept-Encoding header.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+import azure.functions as func
+
+from .timing import stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+
+def dumps(payload) -> bytes:
+    """
+    Serialize a payload to JSON bytes.
+
+    Args:
+        payload: JSON-serializable object (numpy scalars are accepted with orjson)
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # Fall back to stdlib for anything orjson refuses (e.g. big ints)
+            pass
+    return json.dumps(payload).encode("utf-8")
+
+
+def _accepted_encodings(accept_encoding: str) -> dict:
+    encodings = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[token.strip().lower()] = quality
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str):
+    """
+    Pick the best supported content encoding for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value (may be None)
+
+    Returns:
+        str or None: "br", "gzip", or None for an uncompressed body
+    """
+    encodings = _accepted_encodings(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = encodings.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def json_response(
+    payload, status_code: int = 200, req: func.HttpRequest = None, headers=None
+) -> func.HttpResponse:
+    """
+    Build a JSON HttpResponse, compressed when the client accepts it.
+
+    Args:
+        payload: JSON-serializable response body
+        status_code: HTTP status code (default 200)
+        req: Incoming request, used for Accept-Encoding negotiation
+        headers: Optional extra response headers
+
+    Returns:
+        func.HttpResponse: The serialized (and possibly compressed) response
+    """
+    headers = dict(headers or {})
+
+    with stage("serialize"):
+        body = dumps(payload)
+
+        if req is not None:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = None
+            if len(body) >= COMPRESSION_MIN_BYTES:
+                encoding = negotiate_encoding(req.headers.get("Accept-Encoding"))
+            if encoding:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                # A strong ETag identifies one representation, so tag the encoding
+                if "ETag" in headers:
+                    headers["ETag"] = f'{headers["ETag"][:-1]}-{encoding}"'
+
+    return func.HttpResponse(
+        body, status_code=status_code, mimetype="application/json", headers=headers
+    )
+
+
+def error_response(
+    message: str, status_code: int = 500, req: func.HttpRequest = None
+) -> func.HttpResponse:
+    """
+    Build the standard {"status": "error", "message", "timestamp"} JSON response.
+    """
+    return json_response(
+        {
+            "status": "error",
+            "message": message,
+            "timestamp": datetime.utcnow().isoformat(),
+        },
+        status_code=status_code,
+        req=req,
+    )
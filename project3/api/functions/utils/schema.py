@@ -0,0 +1,108 @@
+"""
+Column schema for the recipe datasets.
+
+read_dataset_csv() parses a dataset with memory-lean dtypes:
+- Diet_type and Cuisine_type as categoricals (a handful of distinct values),
+- the macronutrients as float32,
+- Extraction_day as datetime64 and Extraction_time as timedelta64,
+- Recipe_name left as Python strings (nearly all distinct).
+
+Consumers that need only some columns pass them as `columns`, which is
+applied as usecols so the other columns are never parsed. Columns not in the
+file's header are ignored, so a projection never fails on an older file.
+
+memory_report() compares a frame's footprint against the same file parsed
+with pandas' default dtypes.
+"""
+
+import pandas as pd
+
+MACRO_COLUMNS = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+CATEGORY_COLUMNS = ["Diet_type", "Cuisine_type"]
+DAY_COLUMN = "Extraction_day"
+TIME_COLUMN = "Extraction_time"
+
+DTYPES = {
+    **{column: "category" for column in CATEGORY_COLUMNS},
+    **{column: "float32" for column in MACRO_COLUMNS},
+}
+
+# Columns each consumer reads
+INSIGHTS_COLUMNS = ("Diet_type", "Cuisine_type", *MACRO_COLUMNS)
+CLUSTER_COLUMNS = ("Diet_type", "Recipe_name", *MACRO_COLUMNS)
+
+
+def read_dataset_csv(source, columns=None):
+    """
+    Parse a dataset CSV with the lean schema
+
+    Args:
+        source: Path or readable file object
+        columns: Optional iterable of columns to keep; None keeps all
+
+    Returns:
+        pandas.DataFrame: Columns in file order
+    """
+    wanted = None if columns is None else set(columns)
+    df = pd.read_csv(
+        source,
+        usecols=None if wanted is None else (lambda column: column in wanted),
+        dtype=DTYPES,
+    )
+    if DAY_COLUMN in df.columns:
+        df[DAY_COLUMN] = pd.to_datetime(df[DAY_COLUMN], format="%Y-%m-%d")
+    if TIME_COLUMN in df.columns:
+        df[TIME_COLUMN] = pd.to_timedelta(df[TIME_COLUMN])
+    return df
+
+
+def format_day(value):
+    """
+    Extraction_day as the "YYYY-MM-DD" text stored in the file
+    """
+    if value is pd.NaT:
+        return None
+    return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else value
+
+
+def format_time(value):
+    """
+    Extraction_time as the "HH:MM:SS" text stored in the file
+    """
+    if value is pd.NaT:
+        return None
+    if not isinstance(value, pd.Timedelta):
+        return value
+    seconds = int(value.total_seconds())
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def memory_bytes(df):
+    """
+    Returns:
+        dict: Bytes per column (including string contents) and "total"
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    return {
+        **{column: int(size) for column, size in usage.items()},
+        "total": int(usage.sum()),
+    }
+
+
+def memory_report(source, columns=None):
+    """
+    Memory of a dataset parsed with default dtypes versus the lean schema
+
+    Returns:
+        dict: {"default": bytes per column, "schema": bytes per column}
+    """
+    wanted = None if columns is None else set(columns)
+    default = pd.read_csv(
+        source, usecols=None if wanted is None else (lambda column: column in wanted)
+    )
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return {
+        "default": memory_bytes(default),
+        "schema": memory_bytes(read_dataset_csv(source, columns)),
+    }
@@ -0,0 +1,72 @@
+"""
+Single-flight call coalescing
+
+Concurrent callers asking for the same key share one execution of the
+underlying function: the first caller runs it and every caller that arrives
+while it is in flight waits for, and receives, the same result or exception.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of concurrent identical calls
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        """
+        Run fn once for all concurrent callers using the same key
+
+        Args:
+            key: Hashable identity of the call
+            fn: Zero-argument callable producing the result
+
+        Returns:
+            The result of fn, shared with every coalesced caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
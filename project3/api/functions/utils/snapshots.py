@@ -0,0 +1,240 @@
+"""
+Immutable, versioned dataset snapshots with background hot-reload.
+
+A DatasetSnapshot bundles a loaded DataFrame with the version it was read
+at and the indexes built from it. SnapshotStore keeps the current snapshot
+per dataset and a daemon thread that polls each dataset's version every
+refresh interval. When the version changes it builds the new snapshot off
+the request path and swaps it in with a single reference assignment.
+Requests never wait on a reload. Only the very first load of a dataset
+happens on a request. Evicted datasets (see dataset_registry.py) stop being
+polled and are loaded again on their next request.
+
+A request pins the snapshot it first sees (see snapshot_scope), so every
+load_dataset and get_dataset_version call inside it uses the same version,
+even if a swap happens halfway through.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from .metrics import registry
+from .schema import memory_bytes
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# filename -> DatasetSnapshot pinned by the current request, or None outside one
+_pinned: ContextVar = ContextVar("pinned_snapshots", default=None)
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """
+    One version of a dataset and the indexes derived from it
+
+    The DataFrames are shared by every request reading this version and must
+    not be modified in place.
+    """
+
+    filename: str
+    version: str
+    df: object
+    loaded_at: float
+    # Lower-cased Diet_type -> rows of that diet
+    by_diet: MappingProxyType = field(repr=False)
+    # Memory held by df and the per-diet frames
+    memory_bytes: int = 0
+
+    @classmethod
+    def build(cls, filename, version, df):
+        groups = {}
+        if "Diet_type" in df.columns:
+            groups = {
+                str(diet): rows
+                for diet, rows in df.groupby(df["Diet_type"].str.lower(), sort=False)
+            }
+        # The per-diet frames copy the rows' values but share string objects
+        # with df, so only their own arrays are counted
+        size = memory_bytes(df)["total"] + sum(
+            int(rows.memory_usage(deep=False).sum()) for rows in groups.values()
+        )
+        return cls(
+            filename=filename,
+            version=version,
+            df=df,
+            loaded_at=time.time(),
+            by_diet=MappingProxyType(groups),
+            memory_bytes=size,
+        )
+
+    def rows_for_diet(self, diet_type):
+        """
+        Rows whose Diet_type matches diet_type case-insensitively (empty
+        frame with the same columns when there are none)
+        """
+        rows = self.by_diet.get(diet_type.lower())
+        return rows if rows is not None else self.df.iloc[0:0]
+
+
+@contextmanager
+def snapshot_scope():
+    """
+    Pin snapshots for the duration of one request
+    """
+    token = _pinned.set({})
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class SnapshotStore:
+    """
+    Current snapshot per dataset, refreshed in the background
+
+    Args:
+        load: Callable(filename) -> DataFrame
+        probe_version: Callable(filename) -> str, cheap check of the source's
+                       current version (blob ETag, file mtime)
+        interval: Seconds between version polls
+        on_swap: Optional callable(snapshot) run after each swap
+    """
+
+    def __init__(self, load, probe_version, interval, on_swap=None):
+        self._load = load
+        self._probe_version = probe_version
+        self.interval = interval
+        self._on_swap = on_swap
+        self._snapshots = {}
+        self._flight = SingleFlight()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def get(self, filename):
+        """
+        Current snapshot of a dataset, pinned for the rest of the request
+
+        Builds it on the calling thread only if the dataset was never loaded.
+        """
+        pinned = _pinned.get()
+        if pinned is not None and filename in pinned:
+            return pinned[filename]
+
+        snapshot = self._snapshots.get(filename)
+        if snapshot is None:
+            snapshot = self._flight.do(filename, lambda: self._cold_load(filename))
+        if pinned is not None:
+            pinned[filename] = snapshot
+        return snapshot
+
+    def for_frame(self, df):
+        """
+        The snapshot whose DataFrame is df (pinned first, then current), or None
+        """
+        candidates = list((_pinned.get() or {}).values()) + list(
+            self._snapshots.values()
+        )
+        return next((snapshot for snapshot in candidates if snapshot.df is df), None)
+
+    def refresh(self, filename):
+        """
+        Rebuild and swap in a dataset's snapshot if its version changed
+
+        Datasets that are not loaded are left for their next request.
+
+        Returns:
+            bool: True when a new snapshot was swapped in
+        """
+        current = self._snapshots.get(filename)
+        if current is None:
+            return False
+        version = self._probe_version(filename)
+        if current.version == version:
+            return False
+        snapshot = self._build(filename, version)
+        # Evicted while it was being rebuilt
+        if filename not in self._snapshots:
+            return False
+        self._swap(snapshot)
+        return True
+
+    def evict(self, filename):
+        """
+        Drop a dataset's snapshot; requests that pinned it keep their copy
+        """
+        self._snapshots.pop(filename, None)
+
+    def _cold_load(self, filename):
+        # Another caller may have finished the load while we queued
+        snapshot = self._snapshots.get(filename)
+        if snapshot is None:
+            snapshot = self._build(filename, self._probe_version(filename))
+            self._swap(snapshot)
+        self._ensure_refresher()
+        return snapshot
+
+    def _build(self, filename, version):
+        # The version is probed before reading, so a change during the read
+        # is picked up by the next poll instead of being lost
+        started = time.perf_counter()
+        snapshot = DatasetSnapshot.build(filename, version, self._load(filename))
+        registry.observe(
+            "dataset_snapshot_build_ms",
+            (time.perf_counter() - started) * 1000,
+            filename=filename,
+        )
+        return snapshot
+
+    def _swap(self, snapshot):
+        previous = self._snapshots.get(snapshot.filename)
+        self._snapshots[snapshot.filename] = snapshot
+        registry.inc("dataset_snapshot_swaps_total", filename=snapshot.filename)
+        registry.set_info(
+            "dataset_snapshot_info",
+            snapshot.filename,
+            filename=snapshot.filename,
+            version=snapshot.version,
+        )
+        if previous is not None:
+            logger.info(
+                "Swapped %s snapshot %s -> %s",
+                snapshot.filename,
+                previous.version,
+                snapshot.version,
+            )
+        if self._on_swap is not None:
+            self._on_swap(snapshot)
+
+    def _ensure_refresher(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="dataset-refresher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            for filename in list(self._snapshots):
+                try:
+                    self.refresh(filename)
+                except Exception as e:
+                    # Keep serving the current snapshot; retry on the next poll
+                    logger.warning("Refreshing %s failed: %s", filename, e)
+                    registry.inc(
+                        "dataset_snapshot_refresh_errors_total", filename=filename
+                    )
+            now = time.time()
+            for filename, snapshot in list(self._snapshots.items()):
+                registry.set_gauge(
+                    "dataset_snapshot_age_seconds",
+                    round(now - snapshot.loaded_at, 1),
+                    filename=filename,
+                )
@@ -0,0 +1,61 @@
+"""
+Per-request stage timing.
+
+Code anywhere below an instrumented handler marks a stage with:
+
+    with stage("load"):
+        ...
+
+Stages nest: a stage's time excludes the time of stages opened inside it, so
+"compute" never double counts the "load" and "filter" it triggers. Outside a
+timed request, stage() is a no-op.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+current_timer: ContextVar = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    """
+    Accumulates exclusive time per stage for one request
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._stack = []
+
+    def start(self):
+        self._stack.append(0.0)
+
+    def stop(self, name, elapsed_ms):
+        child_ms = self._stack.pop()
+        self.stages[name] = self.stages.get(name, 0.0) + (elapsed_ms - child_ms)
+        if self._stack:
+            self._stack[-1] += elapsed_ms
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a block as the named stage of the current request (no-op outside one)
+    """
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    timer.start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.stop(name, (time.perf_counter() - started) * 1000)
+
+
+def format_server_timing(stages, total_ms):
+    entries = [f"{name};dur={duration:.2f}" for name, duration in stages.items()]
+    entries.append(f"total;dur={total_ms:.2f}")
+    return ", ".join(entries)
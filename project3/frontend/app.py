@@ -1,8 +1,9 @@
 import os
-from flask import Flask, render_template, request, jsonify
+import time
+from flask import Flask, Response, g, render_template, request, jsonify
 from dotenv import load_dotenv
-from utils import proxy_to_function_app
-import requests
+from utils import proxy_to_function_app, get_session, response_cache
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, observe_request, registry
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,6 +19,24 @@ FUNCTION_APP_URL = os.getenv("FUNCTION_APP_URL", "http://localhost:7071")
 # Azure Function App Key - for authentication (only in production)
 FUNCTION_APP_KEY = os.getenv("FUNCTION_APP_KEY", "") if FLASK_ENV == "production" else None
 
+# Response cache for read-only data endpoints (seconds fresh, then seconds served stale)
+DATA_CACHE_TTL = int(os.getenv("DATA_CACHE_TTL", "60"))
+DATA_CACHE_STALE_TTL = int(os.getenv("DATA_CACHE_STALE_TTL", "300"))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    # Streamed responses are timed to the first byte
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    elapsed_ms = (time.perf_counter() - g.request_started) * 1000
+    observe_request(route, request.method, response.status_code, elapsed_ms)
+    return response
+
 
 @app.route("/")
 def index():
@@ -34,7 +53,13 @@ def get_greeting():
 
 
 @app.route("/api/nutritional-insights")
-@proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
+@proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+)
 def get_nutritional_insights():
     """
     Proxy endpoint to call Azure Function App nutritional insights
@@ -50,7 +75,14 @@ def get_nutritional_insights():
 
 
 @app.route("/api/recipes")
-@proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
+@proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+    passthrough=True,
+)
 def get_recipes():
     """
     Proxy endpoint to call Azure Function App recipes
@@ -68,7 +100,13 @@ def get_recipes():
 
 
 @app.route("/api/clusters")
-@proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
+@proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+)
 def get_clusters():
     """
     Proxy endpoint to call Azure Function App clusters
@@ -84,6 +122,70 @@ def get_clusters():
     pass
 
 
+@app.route("/api/dashboard")
+@proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+    passthrough=True,
+)
+def get_dashboard():
+    """
+    Proxy endpoint to call Azure Function App dashboard
+    Returns insights, a page of recipes and clusters in a single round trip
+
+    Query Parameters:
+        - diet_type: (optional) "all", "vegan", "keto", "mediterranean", "paleo", or "dash"
+                     Defaults to "all" if not provided
+        - page: (optional) Recipe page number (1-indexed), defaults to 1
+        - page_size: (optional) Number of recipes per page, defaults to 20
+        - num_clusters: (optional) Number of clusters to create, defaults to 3 (max 20)
+
+    Example: /api/dashboard?diet_type=keto&num_clusters=4
+    """
+    pass
+
+
+@app.route("/api/batch", methods=["POST"])
+@proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
+def get_batch():
+    """
+    Proxy endpoint to run several data sub-requests in one Function App call
+
+    Request body:
+        [
+            {"id": "a", "route": "recipes", "params": {"diet_type": "keto", "page": 2}},
+            {"id": "b", "route": "nutritional-insights", "params": {"diet_type": "vegan"}}
+        ]
+
+    Example: /api/batch
+    """
+    pass
+
+
+@app.route("/api/cache-stats")
+def get_cache_stats():
+    """
+    Hit/miss/eviction counters for the proxy response cache
+
+    Example: /api/cache-stats
+    """
+    return jsonify(response_cache.stats())
+
+
+@app.route("/metrics")
+def get_metrics():
+    """
+    Prometheus text metrics: per-route and upstream Function App latency
+    histograms and proxy cache hit/miss/eviction counters
+
+    Example: /metrics
+    """
+    return Response(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.route("/api/security-status")
 @proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
 def get_security_status():
@@ -102,7 +204,7 @@ def get_security_status():
 
 
 @app.route("/api/cleanup/list", methods=["GET"])
-@proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
+@proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY, passthrough=True)
 def get_cleanup_list():
     """
     Proxy endpoint to list resources in the resource group
@@ -168,7 +270,8 @@ def get_auth_oauth_callback():
             "state": state
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        # The code can be exchanged only once, so a lost response must not be replayed
+        response = get_session(retry=False).get(url, params=params, timeout=10)
         
         if response.status_code != 200:
             return jsonify({"error": f"Function App error: {response.text}"}), 500
@@ -0,0 +1,302 @@
+"""
+Async (ASGI) serving mode for the frontend
+
+Serves the same routes as app.py with the same proxy semantics, but proxies
+through a pooled httpx.AsyncClient so upstream latency does not hold a worker
+thread. Run with:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+
+from app import (
+    DATA_CACHE_STALE_TTL,
+    DATA_CACHE_TTL,
+    FUNCTION_APP_KEY,
+    FUNCTION_APP_URL,
+)
+from utils import response_cache
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, registry
+from utils.async_proxy import (
+    async_proxy_to_function_app,
+    close_async_client,
+    gather_function_app,
+    get_async_client,
+)
+
+templates = Jinja2Templates(directory="templates")
+# Templates are shared with the Flask app, which uses url_for("static", filename=...)
+templates.env.globals["url_for"] = lambda endpoint, filename: f"/static/{filename}"
+
+data_proxy = async_proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+)
+proxy = async_proxy_to_function_app(FUNCTION_APP_URL, FUNCTION_APP_KEY)
+# Large responses are relayed as raw upstream bytes instead of being re-serialized
+passthrough_data_proxy = async_proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+    passthrough=True,
+)
+passthrough_proxy = async_proxy_to_function_app(
+    FUNCTION_APP_URL, FUNCTION_APP_KEY, passthrough=True
+)
+
+
+async def index(request):
+    return templates.TemplateResponse(request, "index.html")
+
+
+@proxy
+async def get_greeting(request):
+    """
+    Proxy endpoint to call Azure Function App greeting
+    """
+
+
+@data_proxy
+async def get_nutritional_insights(request):
+    """
+    Proxy endpoint to call Azure Function App nutritional insights
+    """
+
+
+@passthrough_data_proxy
+async def get_recipes(request):
+    """
+    Proxy endpoint to call Azure Function App recipes
+    """
+
+
+@data_proxy
+async def get_clusters(request):
+    """
+    Proxy endpoint to call Azure Function App clusters
+    """
+
+
+@async_proxy_to_function_app(
+    FUNCTION_APP_URL,
+    FUNCTION_APP_KEY,
+    cache_ttl=DATA_CACHE_TTL,
+    stale_ttl=DATA_CACHE_STALE_TTL,
+    coalesce=True,
+    passthrough=True,
+    endpoint="dashboard",
+)
+async def relay_dashboard(request):
+    """
+    The Function App's /dashboard relayed like Flask's /api/dashboard
+    """
+
+
+async def get_dashboard(request):
+    """
+    Composite endpoint returning insights, a recipe page and clusters
+
+    Relays the Function App's /dashboard endpoint exactly as the Flask app
+    does; if that call fails (e.g. an older Function App without the route)
+    the three sections are fetched from their own endpoints concurrently
+    instead. When every section fails too, the relay's error is returned.
+
+    Query Parameters:
+        - diet_type: (optional) Defaults to "all"
+        - page, page_size: (optional) Recipe pagination, defaults to 1 and 20
+        - num_clusters: (optional) Defaults to 3
+        - dataset: (optional) Dataset to read, defaults to the Function App's
+
+    Example: /api/dashboard?diet_type=keto&num_clusters=4
+    """
+    relayed = await relay_dashboard(request)
+    if relayed.status_code in (200, 304):
+        return relayed
+
+    params = request.query_params
+    cache_options = {
+        "cache_ttl": DATA_CACHE_TTL,
+        "stale_ttl": DATA_CACHE_STALE_TTL,
+        "coalesce": True,
+    }
+
+    diet_type = params.get("diet_type", "all")
+    # Every section must read the dataset the dashboard was asked for
+    dataset = {"dataset": params["dataset"]} if "dataset" in params else {}
+    results = await gather_function_app(
+        FUNCTION_APP_URL,
+        FUNCTION_APP_KEY,
+        {
+            "insights": {
+                "endpoint": "nutritional-insights",
+                "query_params": {"diet_type": diet_type, **dataset},
+                **cache_options,
+            },
+            "recipes": {
+                "endpoint": "recipes",
+                "query_params": {
+                    "diet_type": diet_type,
+                    "page": params.get("page", "1"),
+                    "page_size": params.get("page_size", "20"),
+                    **dataset,
+                },
+                **cache_options,
+            },
+            "clusters": {
+                "endpoint": "clusters",
+                "query_params": {
+                    "diet_type": diet_type,
+                    "num_clusters": params.get("num_clusters", "3"),
+                    **dataset,
+                },
+                **cache_options,
+            },
+        },
+    )
+    if all(status != 200 for _, status in results.values()):
+        return relayed
+    return JSONResponse(
+        {
+            "diet_type": diet_type,
+            **{name: section for name, (section, _) in results.items()},
+        }
+    )
+
+
+@proxy
+async def get_batch(request):
+    """
+    Proxy endpoint to run several data sub-requests in one Function App call
+    """
+
+
+async def get_cache_stats(request):
+    """
+    Hit/miss/eviction counters for the proxy response cache
+    """
+    return JSONResponse(response_cache.stats())
+
+
+async def get_metrics(request):
+    """
+    Prometheus text metrics for this process
+    """
+    return Response(
+        registry.render(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE}
+    )
+
+
+@proxy
+async def get_security_status(request):
+    """
+    Proxy endpoint to call Azure Function App security status
+    """
+
+
+@passthrough_proxy
+async def get_cleanup_list(request):
+    """
+    Proxy endpoint to list resources in the resource group
+    """
+
+
+@proxy
+async def get_cleanup_delete(request):
+    """
+    Proxy endpoint to delete selected resources
+    """
+
+
+@proxy
+async def get_auth_oauth_login(request):
+    """
+    Proxy endpoint to initiate OAuth logins
+    """
+
+
+async def get_auth_oauth_callback(request):
+    """
+    Handle OAuth callback from provider
+    """
+    try:
+        code = request.query_params.get("code")
+        if not code:
+            return JSONResponse(
+                {"error": "Missing authorization code"}, status_code=400
+            )
+
+        params = {
+            "provider": request.query_params.get("provider", "github"),
+            "code": code,
+            "state": request.query_params.get("state"),
+        }
+        response = await get_async_client().get(
+            f"{FUNCTION_APP_URL}/api/auth/oauth/callback", params=params
+        )
+
+        if response.status_code != 200:
+            return JSONResponse(
+                {"error": f"Function App error: {response.text}"}, status_code=500
+            )
+
+        return JSONResponse(response.json())
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+@proxy
+async def get_auth_2fa_setup(request):
+    """
+    Proxy endpoint to generate TOTP secrets and QR images
+    """
+
+
+@proxy
+async def get_auth_2fa_verify(request):
+    """
+    Proxy endpoint to verify submitted 2FA codes
+    """
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_async_client()
+
+
+routes = [
+    Route("/", index),
+    Route("/api/greeting", get_greeting),
+    Route("/api/nutritional-insights", get_nutritional_insights),
+    Route("/api/recipes", get_recipes),
+    Route("/api/clusters", get_clusters),
+    Route("/api/dashboard", get_dashboard),
+    Route("/api/batch", get_batch, methods=["POST"]),
+    Route("/api/cache-stats", get_cache_stats),
+    Route("/metrics", get_metrics),
+    Route("/api/security-status", get_security_status),
+    Route("/api/cleanup/list", get_cleanup_list, methods=["GET"]),
+    Route("/api/cleanup/delete", get_cleanup_delete, methods=["POST"]),
+    Route("/api/auth/oauth/login", get_auth_oauth_login),
+    Route("/api/auth/oauth/callback", get_auth_oauth_callback),
+    Route("/api/auth/2fa-setup", get_auth_2fa_setup, methods=["POST"]),
+    Route("/api/auth/2fa-verify", get_auth_2fa_verify, methods=["POST"]),
+    Mount("/static", app=StaticFiles(directory="static"), name="static"),
+]
+
+app = Starlette(
+    routes=routes, lifespan=lifespan, middleware=[Middleware(MetricsMiddleware)]
+)
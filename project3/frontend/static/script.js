@@ -938,6 +938,44 @@
 		}
 	}
 
+	/**
+	 * ============================================================================
+	 * DASHBOARD FEATURES (Insights, Recipes & Clusters in one request)
+	 * ============================================================================
+	 */
+
+	// LOGIC LAYER - Pure data fetching
+	async function fetchDashboard(dietType = "all", page = 1, pageSize = 20, numClusters = 3) {
+		const response = await fetch(
+			`/api/dashboard?diet_type=${dietType}&page=${page}&page_size=${pageSize}&num_clusters=${numClusters}`,
+		);
+		return await response.json();
+	}
+
+	// ORCHESTRATION LAYER - Connects logic to UI
+	async function loadDashboard(dietType = "all") {
+		let data;
+		try {
+			data = await fetchDashboard(dietType);
+		} catch (error) {
+			displayRecipes({ error: error.message, recipes: [], total_count: 0 });
+			displayClusters({ error: error.message, clusters: [], total_recipes: 0 });
+			return;
+		}
+
+		try {
+			renderBarChart(data.insights);
+			renderScatterPlot(data.insights);
+			renderHeatmap(data.insights);
+			renderPieChart(data.insights);
+		} catch (error) {
+			// Handle error silently or could add error display here
+		}
+		displayRecipes(data.recipes || { error: data.error, recipes: [], total_count: 0 });
+		displayClusters(data.clusters || { error: data.error, clusters: [], total_recipes: 0 });
+		return data;
+	}
+
 	/**
 	 * ============================================================================
 	 * EVENT HANDLERS & DOM INITIALIZATION
@@ -949,8 +987,8 @@
 		// Test greeting endpoint
 		await getGreeting();
 
-		// Load default nutritional insights on page load
-		await getNutritionalInsights("all");
+		// Load default insights, recipes and clusters in a single request
+		await loadDashboard("all");
 
 		// Get the "Get Nutritional Insights" button by finding button with matching text
 		const buttons = document.querySelectorAll("button");
@@ -1,3 +1,5 @@
 from .proxy import proxy_to_function_app
+from .http_session import get_session
+from .cache import response_cache
 
-__all__ = ["proxy_to_function_app"]
+__all__ = ["proxy_to_function_app", "get_session", "response_cache"]
@@ -0,0 +1,357 @@
+"""
+Async counterpart of proxy_to_function_app for the ASGI frontend
+
+Uses one pooled httpx.AsyncClient per process so a slow Function App call
+only holds a coroutine, not a worker thread, and several upstream calls can
+be awaited concurrently for composite endpoints.
+"""
+
+import asyncio
+from functools import wraps
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from .cache import MISS, STALE, normalize_query, response_cache
+from .http_session import POOL_MAXSIZE, RETRY_TOTAL
+from .metrics import track_upstream
+from .proxy import PASSTHROUGH_HEADERS, resolve_endpoint, upstream_error
+from .singleflight import AsyncSingleFlight
+
+UPSTREAM_TIMEOUT = 10
+
+# Request headers that describe the client connection, not the proxied call
+HOP_BY_HOP_HEADERS = {
+    "host",
+    "connection",
+    "keep-alive",
+    "content-length",
+    "transfer-encoding",
+    "accept-encoding",
+}
+
+_client = None
+
+# Coalesces concurrent identical upstream GETs into one Function App call
+async_upstream_flight = AsyncSingleFlight()
+
+# Background stale-cache refreshes; the event loop only holds weak references
+_refresh_tasks = set()
+
+
+def get_async_client():
+    """
+    Get the process-wide httpx.AsyncClient used to reach the Function App
+
+    Returns:
+        httpx.AsyncClient: Shared client with a keep-alive connection pool
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=UPSTREAM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=POOL_MAXSIZE,
+                max_keepalive_connections=POOL_MAXSIZE,
+                keepalive_expiry=30,
+            ),
+            # Retries connection failures only; requests were never sent
+            transport=httpx.AsyncHTTPTransport(retries=RETRY_TOTAL),
+        )
+    return _client
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def fetch_json_async(url, query_params):
+    """
+    GET a Function App URL and parse its JSON body
+
+    Returns:
+        tuple: (body, status_code, headers) where non-200 upstream responses become a 500 error body
+    """
+    with track_upstream(url) as call:
+        response = await get_async_client().get(url, params=query_params)
+        call["status"] = response.status_code
+
+    if response.status_code != 200:
+        return (*upstream_error(response), {})
+
+    return response.json(), 200, {}
+
+
+def _passthrough_headers(response):
+    headers = {
+        name: response.headers[name]
+        for name in PASSTHROUGH_HEADERS
+        if name in response.headers
+    }
+    headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+async def _open_raw(url, query_params, accept_encoding, if_none_match=None):
+    # Ask upstream for an encoding the client accepts so its bytes can be relayed as-is
+    headers = {"Accept-Encoding": accept_encoding or "identity"}
+    if if_none_match:
+        headers["If-None-Match"] = if_none_match
+    request = get_async_client().build_request(
+        "GET",
+        url,
+        params=query_params,
+        headers=headers,
+    )
+    with track_upstream(url) as call:
+        response = await get_async_client().send(request, stream=True)
+        call["status"] = response.status_code
+    return response
+
+
+async def fetch_raw_async(url, query_params, accept_encoding=None):
+    """
+    GET a Function App URL and keep its body as the raw (possibly compressed) bytes
+
+    Returns:
+        tuple: (body, status_code, headers) where non-200 upstream responses become a 500 error body
+    """
+    response = await _open_raw(url, query_params, accept_encoding)
+    try:
+        if response.status_code != 200:
+            await response.aread()
+            return (*upstream_error(response), {})
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+        return body, 200, _passthrough_headers(response)
+    finally:
+        await response.aclose()
+
+
+async def stream_raw_async(url, query_params, accept_encoding=None, if_none_match=None):
+    """
+    GET a Function App URL and relay its body to the client chunk by chunk
+
+    The client's If-None-Match is forwarded and an upstream 304 is relayed as is.
+
+    Returns:
+        starlette Response streaming the upstream bytes, the 304 on 304, or a
+        JSON error on any other status
+    """
+    response = await _open_raw(url, query_params, accept_encoding, if_none_match)
+    if response.status_code == 304:
+        await response.aclose()
+        return Response(status_code=304, headers=_passthrough_headers(response))
+    if response.status_code != 200:
+        await response.aread()
+        await response.aclose()
+        body, status = upstream_error(response)
+        return JSONResponse(body, status_code=status)
+
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=200,
+        headers=_passthrough_headers(response),
+        background=BackgroundTask(response.aclose),
+    )
+
+
+async def proxy_get(
+    function_app_url,
+    function_app_key,
+    endpoint,
+    query_params,
+    cache_ttl=None,
+    stale_ttl=0,
+    coalesce=False,
+    passthrough=False,
+    accept_encoding=None,
+):
+    """
+    Proxy one GET to the Function App with optional caching and coalescing
+
+    Args:
+        function_app_url: Base URL of the Function App
+        function_app_key: Optional function key for authentication
+        endpoint: Function App route (e.g. "recipes")
+        query_params: Query parameters to forward
+        cache_ttl: Optional seconds to serve successful responses from cache
+        stale_ttl: Extra seconds a cached response may be served stale
+        coalesce: Share one upstream call between concurrent identical GETs
+        passthrough: Keep the upstream body as raw bytes instead of parsing it
+        accept_encoding: Client Accept-Encoding to request in passthrough mode
+
+    Returns:
+        tuple: (body, status_code, headers, cache_state)
+    """
+    query_params = dict(query_params)
+    cache_key = f"{endpoint}?{normalize_query(query_params)}"
+    url = f"{function_app_url}/api/{endpoint}"
+    if function_app_key:
+        query_params["code"] = function_app_key
+
+    if passthrough:
+        # Raw bodies differ per negotiated encoding
+        cache_key = f"{cache_key}|{accept_encoding or 'identity'}"
+
+        def fetch_upstream():
+            return fetch_raw_async(url, query_params, accept_encoding)
+    else:
+
+        def fetch_upstream():
+            return fetch_json_async(url, query_params)
+
+    async def fetch():
+        if coalesce:
+            return await async_upstream_flight.do(cache_key, fetch_upstream)
+        return await fetch_upstream()
+
+    if cache_ttl is None:
+        body, status, headers = await fetch()
+        return body, status, headers, None
+
+    cached, state = response_cache.get(cache_key)
+    if state == STALE and response_cache.begin_refresh(cache_key):
+
+        async def refresh():
+            succeeded = False
+            try:
+                result = await fetch()
+                if result[1] == 200:
+                    response_cache.set(cache_key, result, cache_ttl, stale_ttl)
+                succeeded = True
+            finally:
+                response_cache.end_refresh(cache_key, succeeded)
+
+        task = asyncio.ensure_future(refresh())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
+    if state != MISS:
+        body, status, headers = cached
+        return body, status, headers, state
+
+    result = await fetch()
+    if result[1] == 200:
+        response_cache.set(cache_key, result, cache_ttl, stale_ttl)
+    body, status, headers = result
+    return body, status, headers, MISS
+
+
+async def gather_function_app(function_app_url, function_app_key, calls):
+    """
+    Run several proxied GETs concurrently
+
+    Args:
+        function_app_url: Base URL of the Function App
+        function_app_key: Optional function key for authentication
+        calls: Mapping of result name to a dict of proxy_get keyword arguments
+               (endpoint, query_params and optionally cache_ttl/stale_ttl/coalesce)
+
+    Returns:
+        dict: Result name -> (body, status_code); failures become 500 error bodies
+    """
+
+    async def run(options):
+        try:
+            body, status, _, _ = await proxy_get(
+                function_app_url, function_app_key, **options
+            )
+            return body, status
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    names = list(calls)
+    results = await asyncio.gather(*(run(calls[name]) for name in names))
+    return dict(zip(names, results))
+
+
+def async_proxy_to_function_app(
+    function_app_url,
+    function_app_key=None,
+    cache_ttl=None,
+    stale_ttl=0,
+    coalesce=False,
+    passthrough=False,
+    endpoint=None,
+):
+    """
+    Decorator to proxy ASGI requests to Azure Function App and handle errors
+
+    Same arguments and error mapping as proxy_to_function_app, plus endpoint:
+    the Function App route, derived from the view's name when None.
+    """
+
+    def decorator(func):
+        route = endpoint or resolve_endpoint(func.__name__)
+
+        @wraps(func)
+        async def wrapper(request):
+            try:
+                query_params = dict(request.query_params)
+
+                if request.method == "POST":
+                    if function_app_key:
+                        query_params["code"] = function_app_key
+                    try:
+                        payload = await request.json()
+                    except ValueError:
+                        payload = None
+                    headers = {
+                        key: value
+                        for key, value in request.headers.items()
+                        if key.lower() not in HOP_BY_HOP_HEADERS
+                    }
+                    url = f"{function_app_url}/api/{route}"
+                    with track_upstream(url) as call:
+                        response = await get_async_client().post(
+                            url, json=payload, params=query_params, headers=headers
+                        )
+                        call["status"] = response.status_code
+                    if response.status_code != 200:
+                        body, status = upstream_error(response)
+                        return JSONResponse(body, status_code=status)
+                    return JSONResponse(response.json())
+
+                accept_encoding = request.headers.get("accept-encoding")
+                if_none_match = request.headers.get("if-none-match")
+                # Conditional requests go to the Function App, which answers
+                # 304 before loading any data, and never share the cache
+                if passthrough and (
+                    if_none_match or (cache_ttl is None and not coalesce)
+                ):
+                    if function_app_key:
+                        query_params["code"] = function_app_key
+                    return await stream_raw_async(
+                        f"{function_app_url}/api/{route}",
+                        query_params,
+                        accept_encoding,
+                        if_none_match,
+                    )
+
+                body, status, headers, state = await proxy_get(
+                    function_app_url,
+                    function_app_key,
+                    route,
+                    query_params,
+                    cache_ttl=cache_ttl,
+                    stale_ttl=stale_ttl,
+                    coalesce=coalesce,
+                    passthrough=passthrough,
+                    accept_encoding=accept_encoding,
+                )
+                headers = dict(headers)
+                if state:
+                    headers["X-Cache"] = state
+                if isinstance(body, bytes):
+                    return Response(body, status_code=status, headers=headers)
+                return JSONResponse(body, status_code=status, headers=headers)
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,169 @@
+"""
+In-process response cache for read-only proxy endpoints
+
+Entries are kept in LRU order and expire in two steps: while fresh they are
+served directly, and once stale (but still inside the stale window) they are
+served immediately while a single background refresh fetches a new copy.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+FRESH = "HIT"
+STALE = "STALE"
+MISS = "MISS"
+
+
+def normalize_query(params, ignore=("code",)):
+    """
+    Build a stable cache key fragment from query parameters
+
+    Args:
+        params: Mapping of query parameter names to values
+        ignore: Parameter names that never affect the response (e.g. function key)
+
+    Returns:
+        str: Parameters sorted by name, joined as key=value pairs
+    """
+    items = sorted(
+        (key.strip(), str(value).strip())
+        for key, value in params.items()
+        if key not in ignore
+    )
+    return "&".join(f"{key}={value}" for key, value in items)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and stale-while-revalidate
+    """
+
+    def __init__(self, max_entries=256, refresh_workers=2):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="cache-refresh"
+        )
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    def get(self, key):
+        """
+        Look up a key
+
+        Returns:
+            tuple: (value, state) where state is FRESH, STALE or MISS
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, MISS
+
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value, FRESH
+            if now < stale_until:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                return value, STALE
+
+            del self._entries[key]
+            self._stats["misses"] += 1
+            return None, MISS
+
+    def set(self, key, value, ttl, stale_ttl=0):
+        """
+        Store a value that is fresh for ttl seconds and servable stale for stale_ttl more
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (value, now + ttl, now + ttl + stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def begin_refresh(self, key):
+        """
+        Claim the background refresh of a key
+
+        Returns:
+            bool: True if the caller should refresh, False if one is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key, succeeded=True):
+        with self._lock:
+            self._refreshing.discard(key)
+            self._stats["refreshes" if succeeded else "refresh_errors"] += 1
+
+    def refresh_async(self, key, fetch, ttl, stale_ttl=0):
+        """
+        Refresh a stale key in the background, at most once at a time per key
+
+        Args:
+            key: Cache key to refresh
+            fetch: Callable returning (value, cacheable) for the key
+            ttl: Fresh lifetime for the refreshed value
+            stale_ttl: Stale window for the refreshed value
+        """
+        if not self.begin_refresh(key):
+            return
+
+        def run():
+            succeeded = False
+            try:
+                value, cacheable = fetch()
+                if cacheable:
+                    self.set(key, value, ttl, stale_ttl)
+                succeeded = True
+            finally:
+                self.end_refresh(key, succeeded)
+
+        self._executor.submit(run)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of cache counters
+
+        Returns:
+            dict: Hit/miss/eviction counters, current size and hit ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            round((stats["hits"] + stats["stale_hits"]) / lookups, 4)
+            if lookups
+            else 0.0
+        )
+        return stats
+
+
+# Shared cache used by proxy_to_function_app
+response_cache = TTLCache(max_entries=int(os.getenv("PROXY_CACHE_MAX_ENTRIES", "256")))
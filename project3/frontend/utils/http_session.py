@@ -0,0 +1,157 @@
+"""
+Shared HTTP session for calls from the frontend to the Azure Function App
+
+A single requests.Session is reused by every proxied call so TCP/TLS
+connections to the Function App are kept alive and pooled instead of being
+opened per request. Idempotent GETs are retried with backoff, bounded by a
+process-wide retry budget so an upstream outage cannot multiply traffic.
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+# Connection pool sizing (per gunicorn worker process)
+POOL_CONNECTIONS = int(os.getenv("PROXY_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("PROXY_POOL_MAXSIZE", "32"))
+
+# Retry policy for idempotent requests
+RETRY_TOTAL = int(os.getenv("PROXY_RETRY_TOTAL", "2"))
+RETRY_BACKOFF = float(os.getenv("PROXY_RETRY_BACKOFF", "0.2"))
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Retry budget: every request earns RETRY_BUDGET_RATIO tokens, every retry
+# spends one, and at most RETRY_BUDGET_MAX tokens can be banked
+RETRY_BUDGET_RATIO = float(os.getenv("PROXY_RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MAX = float(os.getenv("PROXY_RETRY_BUDGET_MAX", "20"))
+
+_sessions = {}
+_session_lock = threading.Lock()
+
+
+class RetryBudget:
+    """
+    Thread-safe token bucket limiting retries to a fraction of total requests
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, max_tokens=RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self):
+        with self._lock:
+            return self._tokens
+
+
+retry_budget = RetryBudget()
+
+
+class BudgetedRetry(Retry):
+    """
+    urllib3 Retry that gives up early once the shared retry budget is spent
+
+    Budget is only spent on retries that will actually be made. A retryable
+    status with the budget spent is returned to the caller as is.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if retry_budget.tokens < 1:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        # Re-raises errors that are not retried, and exhaustion, before any spend
+        new_retry = super().increment(
+            method=method, url=url, response=response, error=error, **kwargs
+        )
+        if not retry_budget.try_spend():
+            # Out of budget: an error is raised as if it were not retryable, a
+            # response (the last token went to another thread after is_retry)
+            # is returned by urllib3 because raise_on_status is off
+            if error is not None:
+                raise error
+            raise MaxRetryError(
+                kwargs.get("_pool"), url, ResponseError("retry budget exhausted")
+            )
+        return new_retry
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that feeds the retry budget on every outgoing request
+    """
+
+    def send(self, request, **kwargs):
+        retry_budget.record_request()
+        return super().send(request, **kwargs)
+
+
+def _build_session(retry):
+    retries = BudgetedRetry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = PooledAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retries if retry else 0,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    # The session is shared by every user of the frontend, so it must never
+    # carry cookies from one proxied response into another user's request
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session(retry=True):
+    """
+    Get the process-wide requests.Session used to reach the Function App
+
+    The session is created lazily so each gunicorn worker builds its own
+    connection pool after forking.
+
+    Args:
+        retry: Retry idempotent requests; pass False for calls that must
+               reach the Function App at most once (e.g. spending an OAuth
+               code), even on a GET
+
+    Returns:
+        requests.Session: Shared session with pooling (and retries) configured
+    """
+    session = _sessions.get(retry)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(retry)
+            if session is None:
+                session = _sessions[retry] = _build_session(retry)
+    return session
@@ -0,0 +1,260 @@
+"""
+In-process metrics for the frontend
+
+Keeps thread-safe histograms and counters keyed by metric name and labels
+(request latency per route, upstream Function App latency) and renders them,
+together with the proxy response cache counters, in the Prometheus text
+exposition format for the /metrics route.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from .cache import response_cache
+
+# Upper bounds in milliseconds; the implicit last bucket is +Inf
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram of observed values
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Cumulative bucket counts keyed by upper bound ("+Inf" last), sum and count
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], counts):
+            running += bucket_count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+
+class Counter:
+    """
+    Monotonically increasing value
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        with self._lock:
+            return self._value
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value):
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Registry of named metrics, one instance per unique label set, plus
+    collectors that produce samples from other components at scrape time
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, store, name, labels, factory):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = store.get(key)
+            if metric is None:
+                metric = store[key] = factory()
+        return metric
+
+    def observe(self, name, value, **labels):
+        self._get(self._histograms, name, labels, Histogram).observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        self._get(self._counters, name, labels, Counter).inc(amount)
+
+    def register_collector(self, collect):
+        """
+        Add a callable returning (name, type, labels dict, value) samples
+        """
+        self._collectors.append(collect)
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text, one "# TYPE" block per metric name
+        """
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+
+        types, samples = {}, {}
+
+        def add(name, kind, line):
+            types.setdefault(name, kind)
+            samples.setdefault(name, []).append(line)
+
+        for (name, labels), counter in counters:
+            add(name, "counter", f"{name}{_format_labels(labels)} {counter.value}")
+        for collect in self._collectors:
+            for name, kind, labels, value in collect():
+                labels = sorted(labels.items())
+                add(
+                    name, kind, f"{name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        for (name, labels), histogram in histograms:
+            snapshot = histogram.snapshot()
+            labels = list(labels)
+            for bound, count in snapshot["buckets"].items():
+                bucket_labels = _format_labels(labels + [("le", bound)])
+                add(name, "histogram", f"{name}_bucket{bucket_labels} {count}")
+            add(
+                name,
+                "histogram",
+                f"{name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}",
+            )
+            add(
+                name,
+                "histogram",
+                f"{name}_count{_format_labels(labels)} {snapshot['count']}",
+            )
+
+        lines = []
+        for name in sorted(samples):
+            lines.append(f"# TYPE {name} {types[name]}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def upstream_endpoint(url):
+    # http://host/api/recipes -> recipes
+    return url.split("/api/", 1)[-1]
+
+
+@contextmanager
+def track_upstream(url):
+    """
+    Time one Function App call; set call["status"] to the upstream status code
+
+        with track_upstream(url) as call:
+            response = get_session().get(url)
+            call["status"] = response.status_code
+    """
+    call = {"status": "error"}
+    started = time.perf_counter()
+    try:
+        yield call
+    finally:
+        endpoint = upstream_endpoint(url)
+        registry.observe(
+            "upstream_request_duration_ms",
+            (time.perf_counter() - started) * 1000,
+            endpoint=endpoint,
+        )
+        registry.inc(
+            "upstream_requests_total", endpoint=endpoint, status=call["status"]
+        )
+
+
+def observe_request(route, method, status, elapsed_ms):
+    """
+    Record one served request in the per-route latency histogram and counter
+    """
+    registry.observe("request_duration_ms", elapsed_ms, route=route, method=method)
+    registry.inc("requests_total", route=route, method=method, status=status)
+
+
+def _cache_samples():
+    stats = response_cache.stats()
+    for result, key in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses")):
+        yield "proxy_cache_lookups_total", "counter", {"result": result}, stats[key]
+    yield "proxy_cache_evictions_total", "counter", {}, stats["evictions"]
+    yield "proxy_cache_refreshes_total", "counter", {}, stats["refreshes"]
+    yield "proxy_cache_refresh_errors_total", "counter", {}, stats["refresh_errors"]
+    yield "proxy_cache_entries", "gauge", {}, stats["size"]
+    yield "proxy_cache_max_entries", "gauge", {}, stats["max_entries"]
+
+
+registry.register_collector(_cache_samples)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, the counterpart of the Flask
+    request hooks in app.py
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            observe_request(
+                getattr(route, "path", "unmatched"),
+                scope["method"],
+                status["code"],
+                (time.perf_counter() - started) * 1000,
+            )
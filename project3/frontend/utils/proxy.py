@@ -1,35 +1,174 @@
-import requests
 from functools import wraps
-from flask import request
+from flask import Response, request
 
+from .cache import MISS, STALE, normalize_query, response_cache
+from .http_session import get_session
+from .metrics import track_upstream
+from .singleflight import SingleFlight
 
-def proxy_to_function_app(function_app_url, function_app_key=None):
+# Coalesces concurrent identical upstream GETs into one Function App call
+upstream_flight = SingleFlight()
+
+
+def resolve_endpoint(func_name):
+    """
+    Map a view function name to its Function App route
+
+    Args:
+        func_name: Name of the Flask view function (e.g. "get_cleanup_list")
+
+    Returns:
+        str: Function App route (e.g. "cleanup/list")
+    """
+    func_name = func_name.replace("get_", "")
+
+    # Determine endpoint format based on function type
+    if func_name.startswith("auth_") or "cleanup" in func_name:
+        # auth_oauth_login -> auth/oauth/login, cleanup_list -> cleanup/list
+        endpoint = func_name.replace("_", "/")
+        # Handle 2FA special case: auth/2fa_setup -> auth/2fa-setup
+        endpoint = endpoint.replace("2fa_", "2fa-")
+    else:
+        # nutritional_insights -> nutritional-insights
+        endpoint = func_name.replace("_", "-")
+
+    return endpoint
+
+
+# Upstream response headers forwarded verbatim in pass-through mode
+PASSTHROUGH_HEADERS = (
+    "Content-Type",
+    "Content-Encoding",
+    "Content-Length",
+    "ETag",
+    "Cache-Control",
+)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def upstream_error(response):
+    return {
+        "error": f"Function App returned {response.status_code}: {response.text}"
+    }, 500
+
+
+def fetch_json(url, query_params):
+    """
+    GET a Function App URL and parse its JSON body
+
+    Returns:
+        tuple: (body, status_code, headers) where non-200 upstream responses become a 500 error body
+    """
+    with track_upstream(url) as call:
+        response = get_session().get(url, params=query_params, timeout=10)
+        call["status"] = response.status_code
+
+    if response.status_code != 200:
+        return (*upstream_error(response), {})
+
+    return response.json(), 200, {}
+
+
+def _passthrough_headers(response):
+    headers = {
+        name: response.headers[name]
+        for name in PASSTHROUGH_HEADERS
+        if name in response.headers
+    }
+    headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+def _get_raw(url, query_params, accept_encoding, if_none_match=None):
+    # Ask upstream for an encoding the client accepts so its bytes can be relayed as-is
+    headers = {"Accept-Encoding": accept_encoding or "identity"}
+    if if_none_match:
+        headers["If-None-Match"] = if_none_match
+    with track_upstream(url) as call:
+        response = get_session().get(
+            url,
+            params=query_params,
+            timeout=10,
+            stream=True,
+            headers=headers,
+        )
+        call["status"] = response.status_code
+    return response
+
+
+def fetch_raw(url, query_params, accept_encoding=None):
+    """
+    GET a Function App URL and keep its body as the raw (possibly compressed) bytes
+
+    Returns:
+        tuple: (body, status_code, headers) where non-200 upstream responses become a 500 error body
+    """
+    response = _get_raw(url, query_params, accept_encoding)
+    with response:
+        if response.status_code != 200:
+            return (*upstream_error(response), {})
+        body = response.raw.read(decode_content=False)
+        return body, 200, _passthrough_headers(response)
+
+
+def stream_raw(url, query_params, accept_encoding=None, if_none_match=None):
+    """
+    GET a Function App URL and relay its body to the client chunk by chunk
+
+    The client's If-None-Match is forwarded and an upstream 304 is relayed as is.
+
+    Returns:
+        flask.Response or tuple: Streaming response on 200, the 304 on 304,
+        otherwise a (body, 500) error pair
+    """
+    response = _get_raw(url, query_params, accept_encoding, if_none_match)
+    if response.status_code == 304:
+        with response:
+            return Response(status=304, headers=_passthrough_headers(response))
+    if response.status_code != 200:
+        with response:
+            return upstream_error(response)
+
+    def generate():
+        with response:
+            yield from response.raw.stream(STREAM_CHUNK_SIZE, decode_content=False)
+
+    return Response(generate(), status=200, headers=_passthrough_headers(response))
+
+
+def proxy_to_function_app(
+    function_app_url,
+    function_app_key=None,
+    cache_ttl=None,
+    stale_ttl=0,
+    coalesce=False,
+    passthrough=False,
+):
     """
     Decorator to proxy requests to Azure Function App and handle errors
 
     Args:
         function_app_url: Base URL of the Function App
         function_app_key: Optional function key for authentication
+        cache_ttl: Optional seconds to serve successful GET responses from the
+                   in-process cache; caching is disabled when None
+        stale_ttl: Extra seconds a cached response may be served stale while it
+                   is refreshed in the background
+        coalesce: Share one upstream call between concurrent identical GETs;
+                  only safe for endpoints whose response does not depend on the caller
+        passthrough: Relay upstream GET bodies as raw bytes with their content-type
+                     and encoding instead of parsing and re-serializing the JSON;
+                     streamed when neither caching nor coalescing is enabled
     """
 
     def decorator(func):
+        endpoint = resolve_endpoint(func.__name__)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
-                # Get the endpoint name from the function
-                func_name = func.__name__.replace("get_", "")
-
-                # Determine endpoint format based on function type
-                if func_name.startswith("auth_") or "cleanup" in func_name:
-                    # auth_oauth_login -> auth/oauth/login, cleanup_list -> cleanup/list
-                    endpoint = func_name.replace("_", "/")
-                    # Handle 2FA special case: auth/2fa_setup -> auth/2fa-setup
-                    endpoint = endpoint.replace("2fa_", "2fa-")
-                else:
-                    # nutritional_insights -> nutritional-insights
-                    endpoint = func_name.replace("_", "-")
-
                 query_params = request.args.to_dict()
+                cache_key = f"{endpoint}?{normalize_query(query_params)}"
 
                 # Build URL
                 url = f"{function_app_url}/api/{endpoint}"
@@ -38,18 +177,57 @@ def proxy_to_function_app(function_app_url, function_app_key=None):
                 if function_app_key:
                     query_params["code"] = function_app_key
 
-                # Make request to Function App - support both GET and POST
+                # Make request to Function App over the shared pooled session
                 if request.method == "POST":
-                    response = requests.post(url, json=request.get_json(), params=query_params, timeout=10, headers=request.headers)
+                    with track_upstream(url) as call:
+                        response = get_session().post(url, json=request.get_json(), params=query_params, timeout=10, headers=request.headers)
+                        call["status"] = response.status_code
+                    if response.status_code != 200:
+                        return upstream_error(response)
+                    return response.json()
+
+                if passthrough:
+                    accept_encoding = request.headers.get("Accept-Encoding")
+                    if_none_match = request.headers.get("If-None-Match")
+                    # Conditional requests go to the Function App, which answers
+                    # 304 before loading any data, and never share the cache
+                    if if_none_match or (cache_ttl is None and not coalesce):
+                        return stream_raw(
+                            url, query_params, accept_encoding, if_none_match
+                        )
+                    # Raw bodies differ per negotiated encoding
+                    cache_key = f"{cache_key}|{accept_encoding or 'identity'}"
+
+                    def fetch_upstream():
+                        return fetch_raw(url, query_params, accept_encoding)
                 else:
-                    response = requests.get(url, params=query_params, timeout=10)
 
-                if response.status_code != 200:
-                    return {
-                        "error": f"Function App returned {response.status_code}: {response.text}"
-                    }, 500
+                    def fetch_upstream():
+                        return fetch_json(url, query_params)
+
+                def fetch():
+                    if coalesce:
+                        result = upstream_flight.do(cache_key, fetch_upstream)
+                    else:
+                        result = fetch_upstream()
+                    return result, result[1] == 200
+
+                if cache_ttl is None:
+                    result, _ = fetch()
+                    return result
+
+                cached, state = response_cache.get(cache_key)
+                if state == STALE:
+                    response_cache.refresh_async(cache_key, fetch, cache_ttl, stale_ttl)
+                if state != MISS:
+                    body, status, headers = cached
+                    return body, status, {**headers, "X-Cache": state}
 
-                return response.json()
+                result, cacheable = fetch()
+                if cacheable:
+                    response_cache.set(cache_key, result, cache_ttl, stale_ttl)
+                body, status, headers = result
+                return body, status, {**headers, "X-Cache": MISS}
             except Exception as e:
                 return {"error": str(e)}, 500
 
@@ -0,0 +1,9 @@
+"""
+Local end-to-end load-test harness.
+
+- blob_stub: Azurite-compatible Blob Storage stub serving the datasets
+- function_host: HTTP stand-in running the Function App handlers
+- profiles / driver: weighted traffic mixes and the closed-loop driver
+
+Run `python -m loadtest --help` from project3/ for usage.
+"""
@@ -0,0 +1,281 @@
+"""
+End-to-end load test: blob stub -> Function App stand-in -> frontend.
+
+Starts each tier as a local subprocess, drives a traffic profile against the
+frontend and reports throughput, p50/p95/p99 latency and error rate per
+route. Run from project3/:
+
+    python -m loadtest --profile mixed --concurrency 16 --duration 30
+    python -m loadtest --frontend asgi --workers 2 --profile browse
+    python -m loadtest --rows 500000          # synthetic All_Diets.csv
+    python -m loadtest --frontend-url http://localhost:5000   # existing frontend
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from .blob_stub import connection_string
+from .driver import format_report, run_load
+from .profiles import PROFILES
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+API_DIR = PROJECT_DIR / "api"
+FRONTEND_DIR = PROJECT_DIR / "frontend"
+STARTUP_TIMEOUT = 60
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(url, process, timeout=STARTUP_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"{url} exited during startup (code {process.returncode})"
+            )
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not start within {timeout}s")
+
+
+def prepare_datasets(rows, seed, workdir):
+    """
+    Directory of dataset files to seed the blob stub with
+
+    With rows, All_Diets.csv is replaced by a synthetic dataset of that size.
+    """
+    if not rows:
+        return API_DIR / "functions" / "datasets"
+
+    sys.path.insert(0, str(API_DIR))
+    from benchmarks.synthetic import write_dataset
+
+    datasets = workdir / "datasets"
+    datasets.mkdir()
+    print(f"Generating {rows} synthetic rows...", flush=True)
+    write_dataset(datasets / "All_Diets.csv", rows, seed=seed)
+    return datasets
+
+
+def frontend_command(kind, port, workers, threads):
+    bind = f"127.0.0.1:{port}"
+    if kind == "gunicorn":
+        return [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--bind",
+            bind,
+            "--workers",
+            str(workers),
+            "--threads",
+            str(threads),
+            "--timeout",
+            "60",
+            "app:app",
+        ]
+    if kind == "asgi":
+        return [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "asgi:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+        ]
+    # Flask development server, threaded
+    return [
+        sys.executable,
+        "-m",
+        "flask",
+        "--app",
+        "app",
+        "run",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--with-threads",
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Recorded seconds")
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="Unrecorded seconds first"
+    )
+    parser.add_argument(
+        "--frontend",
+        choices=["gunicorn", "asgi", "flask"],
+        default="gunicorn",
+        help="How to serve the frontend (default: gunicorn, as in the Dockerfile)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Frontend worker processes"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=4, help="Threads per gunicorn worker"
+    )
+    parser.add_argument(
+        "--frontend-url", help="Drive an already running frontend instead"
+    )
+    parser.add_argument(
+        "--no-blob",
+        action="store_true",
+        help="Read datasets from local files, not the blob stub",
+    )
+    parser.add_argument(
+        "--rows", type=int, help="Serve a synthetic dataset of this many rows"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    processes = []
+    logs = []
+
+    def start(name, command, cwd, env, ready_url):
+        log = open(workdir / f"{name}.log", "w")
+        logs.append(log)
+        process = subprocess.Popen(
+            command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        processes.append(process)
+        try:
+            wait_until_ready(ready_url, process)
+        except RuntimeError:
+            log.flush()
+            print((workdir / f"{name}.log").read_text()[-2000:], file=sys.stderr)
+            raise
+        print(f"{name} ready at {ready_url}", flush=True)
+
+    try:
+        base_url = args.frontend_url
+        if not base_url:
+            env = {**os.environ, "PYTHONPATH": str(PROJECT_DIR)}
+            env.pop("AZURE_KEYVAULT_URL", None)
+            env.pop("AZURE_STORAGE_CONNECTION_STRING", None)
+
+            if not args.no_blob:
+                datasets = prepare_datasets(args.rows, args.seed, workdir)
+                blob_port = free_port()
+                start(
+                    "blob-stub",
+                    [
+                        sys.executable,
+                        "-m",
+                        "loadtest.blob_stub",
+                        "--port",
+                        str(blob_port),
+                        "--seed-dir",
+                        str(datasets),
+                    ],
+                    PROJECT_DIR,
+                    env,
+                    f"http://127.0.0.1:{blob_port}/",
+                )
+                env["AZURE_STORAGE_CONNECTION_STRING"] = connection_string(blob_port)
+
+            api_port = free_port()
+            start(
+                "function-host",
+                [
+                    sys.executable,
+                    "-m",
+                    "loadtest.function_host",
+                    "--port",
+                    str(api_port),
+                ],
+                PROJECT_DIR,
+                env,
+                f"http://127.0.0.1:{api_port}/api/greeting",
+            )
+
+            frontend_port = free_port()
+            frontend_env = {
+                **env,
+                "FUNCTION_APP_URL": f"http://127.0.0.1:{api_port}",
+                "FLASK_ENV": "production",
+                "FUNCTION_APP_KEY": "",
+            }
+            start(
+                f"frontend-{args.frontend}",
+                frontend_command(
+                    args.frontend, frontend_port, args.workers, args.threads
+                ),
+                FRONTEND_DIR,
+                frontend_env,
+                f"http://127.0.0.1:{frontend_port}/api/cache-stats",
+            )
+            base_url = f"http://127.0.0.1:{frontend_port}"
+
+        print(
+            f"Driving profile '{args.profile}' with {args.concurrency} workers for "
+            f"{args.duration:g}s (+{args.warmup:g}s warm-up)...",
+            flush=True,
+        )
+        summary = run_load(
+            base_url,
+            args.profile,
+            args.concurrency,
+            args.duration,
+            args.warmup,
+            args.seed,
+        )
+        print(format_report(summary))
+
+        if args.output:
+            report = {
+                "config": {
+                    key: (str(value) if isinstance(value, Path) else value)
+                    for key, value in vars(args).items()
+                },
+                **summary,
+            }
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(json.dumps(report, indent=2))
+            print(f"Report written to {args.output}")
+        return 0 if summary["total"]["requests"] else 1
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for log in logs:
+            log.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Minimal Azurite-compatible Blob Storage stub.
+
+Implements just enough of the Blob service REST API (path-style URLs, as
+Azurite uses) for azure-storage-blob clients: Put Blob, Get Blob (with
+ranges), Get Blob Properties and List Blobs. Requests are not authenticated.
+
+    python -m loadtest.blob_stub --port 10000 --seed-dir api/functions/datasets
+
+Clients connect with connection_string(port), which uses Azurite's
+well-known development account.
+"""
+
+import argparse
+import hashlib
+import re
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.sax.saxutils import escape
+
+ACCOUNT_NAME = "devstoreaccount1"
+# Azurite's published development key; the stub does not verify signatures
+ACCOUNT_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+API_VERSION = "2025-01-05"
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+def connection_string(port, host="127.0.0.1"):
+    return (
+        "DefaultEndpointsProtocol=http;"
+        f"AccountName={ACCOUNT_NAME};AccountKey={ACCOUNT_KEY};"
+        f"BlobEndpoint=http://{host}:{port}/{ACCOUNT_NAME};"
+    )
+
+
+class BlobStore:
+    """
+    Thread-safe in-memory blobs keyed by (container, name)
+    """
+
+    def __init__(self):
+        self._blobs = {}
+        self._lock = threading.Lock()
+
+    def put(self, container, name, data, content_type="application/octet-stream"):
+        blob = {
+            "data": data,
+            "content_type": content_type,
+            "etag": f'"0x{hashlib.md5(data).hexdigest()[:16].upper()}"',
+            "last_modified": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._blobs[(container, name)] = blob
+        return blob
+
+    def get(self, container, name):
+        with self._lock:
+            return self._blobs.get((container, name))
+
+    def list(self, container, prefix=""):
+        with self._lock:
+            return sorted(
+                (name, blob)
+                for (blob_container, name), blob in self._blobs.items()
+                if blob_container == container and name.startswith(prefix)
+            )
+
+    def seed_directory(self, directory, container="datasets"):
+        """
+        Upload every file of a directory into a container
+
+        Returns:
+            int: Number of blobs uploaded
+        """
+        count = 0
+        for path in sorted(Path(directory).iterdir()):
+            if path.is_file():
+                content_type = "text/csv" if path.suffix == ".csv" else None
+                self.put(
+                    container,
+                    path.name,
+                    path.read_bytes(),
+                    content_type or "application/octet-stream",
+                )
+                count += 1
+        return count
+
+
+class BlobRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parse(self):
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        if parts and parts[0] == ACCOUNT_NAME:
+            parts = parts[1:]
+        container = parts[0] if parts else None
+        name = "/".join(parts[1:]) or None
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return container, name, query
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        self.send_header("x-ms-version", API_VERSION)
+        self.send_header(
+            "x-ms-request-id", self.headers.get("x-ms-client-request-id", "stub")
+        )
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status, code, message):
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f"<Error><Code>{code}</Code><Message>{escape(message)}</Message></Error>"
+        ).encode("utf-8")
+        self._send(
+            status, body, {"Content-Type": "application/xml", "x-ms-error-code": code}
+        )
+
+    def _blob_headers(self, blob):
+        return {
+            "Content-Type": blob["content_type"],
+            "ETag": blob["etag"],
+            "Last-Modified": format_datetime(blob["last_modified"], usegmt=True),
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-creation-time": format_datetime(blob["last_modified"], usegmt=True),
+            "x-ms-lease-state": "available",
+            "x-ms-lease-status": "unlocked",
+            "x-ms-server-encrypted": "true",
+            "Accept-Ranges": "bytes",
+        }
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        container, name, query = self._parse()
+        if name is None and query.get("comp") == "list":
+            return self._list(container, query)
+
+        blob = self.store.get(container, name) if name else None
+        if blob is None:
+            return self._error(
+                404, "BlobNotFound", "The specified blob does not exist."
+            )
+
+        data = blob["data"]
+        headers = self._blob_headers(blob)
+        requested = self.headers.get("x-ms-range") or self.headers.get("Range")
+        match = _RANGE.match(requested or "")
+        if not match:
+            if self.command == "HEAD":
+                # Properties report the blob size without sending it
+                self.send_response(200)
+                self.send_header("x-ms-version", API_VERSION)
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                return
+            return self._send(200, data, headers)
+
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(data) - 1
+        if start >= len(data):
+            return self._error(416, "InvalidRange", "The range specified is invalid.")
+        end = min(end, len(data) - 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        return self._send(206, data[start : end + 1], headers)
+
+    def do_PUT(self):
+        container, name, query = self._parse()
+        length = int(self.headers.get("Content-Length", "0"))
+        data = self.rfile.read(length)
+        if name is None:
+            # Create Container: containers exist implicitly
+            return self._send(201)
+        blob = self.store.put(
+            container,
+            name,
+            data,
+            self.headers.get("x-ms-blob-content-type", "application/octet-stream"),
+        )
+        return self._send(
+            201,
+            headers={
+                "ETag": blob["etag"],
+                "Last-Modified": format_datetime(blob["last_modified"], usegmt=True),
+                "x-ms-request-server-encrypted": "true",
+            },
+        )
+
+    def _list(self, container, query):
+        items = []
+        for name, blob in self.store.list(container, query.get("prefix", "")):
+            items.append(
+                f"<Blob><Name>{escape(name)}</Name><Properties>"
+                f"<Last-Modified>{format_datetime(blob['last_modified'], usegmt=True)}</Last-Modified>"
+                f"<Etag>{blob['etag']}</Etag>"
+                f"<Content-Length>{len(blob['data'])}</Content-Length>"
+                f"<Content-Type>{blob['content_type']}</Content-Type>"
+                "<BlobType>BlockBlob</BlobType>"
+                "</Properties></Blob>"
+            )
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<EnumerationResults ServiceEndpoint="http://127.0.0.1/{ACCOUNT_NAME}" '
+            f'ContainerName="{escape(container or "")}">'
+            f"<Blobs>{''.join(items)}</Blobs><NextMarker /></EnumerationResults>"
+        ).encode("utf-8")
+        return self._send(200, body, {"Content-Type": "application/xml"})
+
+
+def start_server(store, port=0, host="127.0.0.1"):
+    """
+    Serve a BlobStore on a background thread
+
+    Returns:
+        ThreadingHTTPServer: The running server; its port is server.server_port
+    """
+    handler = type("Handler", (BlobRequestHandler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="blob-stub").start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=10000)
+    parser.add_argument(
+        "--seed-dir", type=Path, help="Directory uploaded into the datasets container"
+    )
+    args = parser.parse_args(argv)
+
+    store = BlobStore()
+    if args.seed_dir:
+        store.seed_directory(args.seed_dir)
+    handler = type("Handler", (BlobRequestHandler,), {"store": store})
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"Blob stub listening on {connection_string(args.port)}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Closed-loop load driver and per-route report.
+
+Each of --concurrency workers sends one request at a time, picked from the
+traffic profile by weight, for the requested duration. Requests finishing
+during the warm-up period are not recorded.
+"""
+
+import random
+import threading
+import time
+
+import numpy as np
+import requests
+
+from .profiles import PROFILES
+
+REQUEST_TIMEOUT = 30
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = 0
+        self.statuses = {}
+
+
+def _pick(templates, rng):
+    return rng.choices(templates, weights=[t.weight for t in templates])[0]
+
+
+def run_load(base_url, profile, concurrency, duration, warmup=0.0, seed=0):
+    """
+    Drive a traffic profile against a base URL
+
+    Args:
+        base_url: Frontend URL (e.g. "http://127.0.0.1:5000")
+        profile: Name of a profile in PROFILES
+        concurrency: Number of concurrent workers
+        duration: Seconds of recorded load
+        warmup: Seconds of unrecorded load before that
+        seed: Seed for the request mix
+
+    Returns:
+        dict: Per-route summary plus totals (see summarize())
+    """
+    templates = PROFILES[profile]
+    stats = {}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    record_from = started + warmup
+    stop_at = record_from + duration
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                break
+            method, route, params, body = _pick(templates, rng).build(rng)
+            status, failed = None, False
+            try:
+                response = session.request(
+                    method,
+                    f"{base_url}{route}",
+                    params=params,
+                    json=body,
+                    timeout=REQUEST_TIMEOUT,
+                )
+                response.content
+                status = response.status_code
+                failed = status >= 400
+            except requests.RequestException:
+                status, failed = "exception", True
+            done = time.perf_counter()
+            if sent < record_from:
+                continue
+            with lock:
+                route_stats = stats.setdefault(route, RouteStats())
+                route_stats.latencies_ms.append((done - sent) * 1000)
+                route_stats.errors += failed
+                route_stats.statuses[status] = route_stats.statuses.get(status, 0) + 1
+
+    threads = [
+        threading.Thread(target=worker, args=(i,), daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize(stats, duration)
+
+
+def _latency_summary(latencies):
+    values = np.asarray(latencies)
+    return {
+        "p50": round(float(np.percentile(values, 50)), 2),
+        "p95": round(float(np.percentile(values, 95)), 2),
+        "p99": round(float(np.percentile(values, 99)), 2),
+        "mean": round(float(values.mean()), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+def summarize(stats, duration):
+    """
+    Returns:
+        dict: {"routes": {route: summary}, "total": summary} where a summary has
+              requests, throughput_rps, error_rate, latency_ms and statuses
+    """
+    routes = {}
+    all_latencies, all_errors = [], 0
+    for route, route_stats in sorted(stats.items()):
+        count = len(route_stats.latencies_ms)
+        all_latencies.extend(route_stats.latencies_ms)
+        all_errors += route_stats.errors
+        routes[route] = {
+            "requests": count,
+            "throughput_rps": round(count / duration, 2),
+            "error_rate": round(route_stats.errors / count, 4),
+            "latency_ms": _latency_summary(route_stats.latencies_ms),
+            "statuses": {str(k): v for k, v in route_stats.statuses.items()},
+        }
+
+    total = {"requests": len(all_latencies), "throughput_rps": 0.0, "error_rate": 0.0}
+    if all_latencies:
+        total.update(
+            throughput_rps=round(len(all_latencies) / duration, 2),
+            error_rate=round(all_errors / len(all_latencies), 4),
+            latency_ms=_latency_summary(all_latencies),
+        )
+    return {"routes": routes, "total": total}
+
+
+def format_report(summary):
+    lines = [
+        f"{'route':<28} {'reqs':>7} {'req/s':>8} {'err%':>6} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    ]
+    rows = list(summary["routes"].items())
+    if summary["total"]["requests"]:
+        rows.append(("TOTAL", summary["total"]))
+    for route, s in rows:
+        latency = s["latency_ms"]
+        lines.append(
+            f"{route:<28} {s['requests']:>7} {s['throughput_rps']:>8.1f} "
+            f"{s['error_rate'] * 100:>5.1f}% {latency['p50']:>9.1f} "
+            f"{latency['p95']:>9.1f} {latency['p99']:>9.1f}"
+        )
+    return "\n".join(lines)
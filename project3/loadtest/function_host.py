@@ -0,0 +1,120 @@
+"""
+Local HTTP stand-in for the Function App.
+
+Serves the handlers registered in api/function_app.py under /api/<route>,
+one thread per request (as the Functions Python worker runs sync handlers on
+a thread pool), without the Functions host or Azure.
+
+    python -m loadtest.function_host --port 7071
+
+Set AZURE_STORAGE_CONNECTION_STRING (e.g. to the blob stub) to exercise the
+blob loading path; otherwise datasets are read from api/functions/datasets.
+"""
+
+import argparse
+import re
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
+
+API_DIR = Path(__file__).resolve().parent.parent / "api"
+
+
+def _route_pattern(route):
+    # "profiles/{profile_id}" -> ^profiles/(?P<profile_id>[^/]+)$
+    pattern = re.sub(r"\{(\w+)(?::\w+)?\}", r"(?P<\1>[^/]+)", route)
+    return re.compile(f"^{pattern}$")
+
+
+def load_routes():
+    """
+    Import function_app and collect its HTTP routes
+
+    Returns:
+        list: (compiled route pattern, allowed methods or None, handler)
+    """
+    sys.path.insert(0, str(API_DIR))
+    import function_app
+
+    routes = []
+    for function in function_app.app.get_functions():
+        trigger = function.get_trigger()
+        route = getattr(trigger, "route", None)
+        if route is None:
+            continue
+        methods = None
+        if trigger.methods:
+            methods = {str(getattr(m, "value", m)).upper() for m in trigger.methods}
+        routes.append((_route_pattern(route), methods, function.get_user_function()))
+    return routes
+
+
+class FunctionHostHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    routes = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        import azure.functions as func
+
+        url = urlparse(self.path)
+        path = url.path.removeprefix("/api/").strip("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        for pattern, methods, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if methods and self.command not in methods:
+                return self._respond(405, b"", {})
+            req = func.HttpRequest(
+                method=self.command,
+                url=f"http://{self.headers.get('Host', 'localhost')}{self.path}",
+                headers=dict(self.headers.items()),
+                params=dict(parse_qsl(url.query)),
+                route_params=match.groupdict(),
+                body=body,
+            )
+            response = handler(req)
+            headers = dict(response.headers.items())
+            if response.mimetype and "content-type" not in {k.lower() for k in headers}:
+                headers["Content-Type"] = response.mimetype
+            return self._respond(
+                response.status_code, response.get_body() or b"", headers
+            )
+
+        return self._respond(404, b"", {})
+
+    def _respond(self, status, body, headers):
+        self.send_response(status)
+        for key, value in headers.items():
+            if key.lower() not in ("content-length", "transfer-encoding", "connection"):
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _dispatch
+
+
+def serve(port=7071, host="127.0.0.1"):
+    handler = type("Handler", (FunctionHostHandler,), {"routes": load_routes()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Function host listening on http://{host}:{port}", flush=True)
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=7071)
+    args = parser.parse_args(argv)
+    serve(args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Traffic profiles for the load-test driver.
+
+A profile is a list of weighted request templates. Each template names the
+frontend route it exercises (the label results are grouped by) and builds
+its query parameters or JSON body from the driver's seeded random generator.
+"""
+
+DIET_TYPES = ["all", "vegan", "keto", "mediterranean", "paleo", "dash"]
+
+
+class RequestTemplate:
+    def __init__(self, weight, route, method="GET", params=None, body=None):
+        self.weight = weight
+        self.route = route
+        self.method = method
+        self._params = params or (lambda rng: {})
+        self._body = body
+
+    def build(self, rng):
+        """
+        Returns:
+            tuple: (method, path, params, json body or None)
+        """
+        body = self._body(rng) if self._body else None
+        return self.method, self.route, self._params(rng), body
+
+
+def _diet(rng):
+    return {"diet_type": rng.choice(DIET_TYPES)}
+
+
+def _recipes_page(rng):
+    return {**_diet(rng), "page": rng.randint(1, 20), "page_size": 20}
+
+
+def _clusters(rng):
+    return {**_diet(rng), "num_clusters": rng.randint(2, 8)}
+
+
+def _batch(rng):
+    diet = rng.choice(DIET_TYPES)
+    return [
+        {
+            "id": "insights",
+            "route": "nutritional-insights",
+            "params": {"diet_type": diet},
+        },
+        {
+            "id": "recipes",
+            "route": "recipes",
+            "params": {"diet_type": diet, "page": rng.randint(1, 5)},
+        },
+        {"id": "clusters", "route": "clusters", "params": {"diet_type": diet}},
+    ]
+
+
+PROFILES = {
+    # Dashboard page loads and recipe paging
+    "browse": [
+        RequestTemplate(40, "/api/dashboard", params=_diet),
+        RequestTemplate(40, "/api/recipes", params=_recipes_page),
+        RequestTemplate(20, "/api/nutritional-insights", params=_diet),
+    ],
+    # Clustering-heavy exploration
+    "analytics": [
+        RequestTemplate(50, "/api/clusters", params=_clusters),
+        RequestTemplate(30, "/api/nutritional-insights", params=_diet),
+        RequestTemplate(20, "/api/dashboard", params=_diet),
+    ],
+    # Multiplexed sub-requests
+    "batch": [
+        RequestTemplate(100, "/api/batch", method="POST", body=_batch),
+    ],
+    # A bit of everything
+    "mixed": [
+        RequestTemplate(5, "/api/greeting", params=lambda rng: {"name": "load"}),
+        RequestTemplate(20, "/api/nutritional-insights", params=_diet),
+        RequestTemplate(30, "/api/recipes", params=_recipes_page),
+        RequestTemplate(15, "/api/clusters", params=_clusters),
+        RequestTemplate(20, "/api/dashboard", params=_diet),
+        RequestTemplate(5, "/api/batch", method="POST", body=_batch),
+        RequestTemplate(5, "/api/cache-stats"),
+    ],
+}